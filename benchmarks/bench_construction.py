@@ -0,0 +1,26 @@
+"""
+Benchmark construction cost of the Jenkins metadata classes.
+
+Run from the repository root:
+
+    python benchmarks/bench_construction.py
+"""
+from __future__ import print_function
+
+from lxmlbind.tests.test_jenkins import MetadataDate, MetadataNumber, MetadataString, MetadataTree
+
+from harness import bench
+
+
+NUMBER = 10000
+
+
+def main():
+    xml = MetadataDate().to_xml()
+    for cls in (MetadataString, MetadataNumber, MetadataDate, MetadataTree):
+        bench("{}()".format(cls.__name__), cls, NUMBER)
+    bench("MetadataDate.from_xml()", lambda: MetadataDate.from_xml(xml), NUMBER)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark batch decoding of small messages.
+
+Run from the repository root:
+
+    python benchmarks/bench_decode.py [count]
+"""
+from __future__ import print_function
+
+import sys
+
+from lxmlbind.tests.test_jenkins import MetadataDate
+
+from harness import timed
+
+
+def get_time(date):
+    return date.time
+
+
+def main(count):
+    date = MetadataDate()
+    date.name = "time"
+    date.time = 1385409911044
+    xmls = [date.to_xml()] * count
+
+    timed("from_xml", lambda: [get_time(MetadataDate.from_xml(xml)) for xml in xmls], count)
+    timed("from_xml_many", lambda: list(MetadataDate.from_xml_many(xmls, func=get_time)), count)
+    for workers in (1, 4, 8):
+        timed("from_xml_many, {} workers".format(workers),
+              lambda: list(MetadataDate.from_xml_many(xmls, func=get_time, workers=workers, chunksize=1000)),
+              count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
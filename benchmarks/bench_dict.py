@@ -0,0 +1,44 @@
+"""
+Benchmark keyed `Dict` operations.
+
+Run from the repository root:
+
+    python benchmarks/bench_dict.py [size]
+"""
+from __future__ import print_function
+
+import sys
+
+from lxmlbind.tests.test_keydict import KeyDict
+from lxmlbind.tests.test_person import Person
+
+from harness import timed
+
+
+def main(size):
+    people = [Person(first="first{}".format(index), last="last{}".format(index)) for index in range(size)]
+
+    def build():
+        key_dict = KeyDict()
+        for person in people:
+            key_dict.add(person)
+        return key_dict
+    key_dict = timed("add {} items".format(size), build, size)
+
+    def lookup():
+        for index in range(size):
+            key_dict["first{}".format(index)]
+    timed("__getitem__ x {}".format(size), lookup, size)
+
+    def contains():
+        for index in range(size):
+            "missing{}".format(index) in key_dict
+    timed("__contains__ (miss) x {}".format(size), contains, size)
+
+    timed("len() x {}".format(size), lambda: [len(key_dict) for _ in range(size)], size)
+    timed("keys() of {} items".format(size), key_dict.keys, size)
+    timed("items() of {} items".format(size), key_dict.items, size)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,42 @@
+"""
+Benchmark binding by wrapper objects against binding by custom element classes.
+
+Run from the repository root:
+
+    python benchmarks/bench_element.py [size]
+"""
+from __future__ import print_function
+
+import sys
+
+from lxmlbind.api import element_class
+from lxmlbind.tests.test_addressbookentry import AddressBookEntry
+from lxmlbind.tests.test_person import Person
+from lxmlbind.tests.test_personlist import PersonList
+
+from harness import timed
+
+
+def main(size):
+    people = PersonList()
+    for index in range(size):
+        people.append(Person(first="first{}".format(index), last="last{}".format(index)))
+    xml = people.to_xml()
+
+    wrapped = timed("decode wrapped x {}".format(size), lambda: PersonList.from_xml(xml), size)
+    bound = timed("decode bound x {}".format(size), lambda: element_class(PersonList).from_xml(xml), size)
+
+    timed("[item.first] wrapped x {}".format(size), lambda: [person.first for person in wrapped], size)
+    timed("[item.first] bound x {}".format(size), lambda: [person.first for person in bound], size)
+
+    entry_xml = AddressBookEntry(person=Person(first="John")).to_xml()
+    entry = AddressBookEntry.from_xml(entry_xml)
+    bound_entry = element_class(AddressBookEntry).from_xml(entry_xml)
+    timed("entry.person.first wrapped x {}".format(size),
+          lambda: [entry.person.first for _ in range(size)], size)
+    timed("entry.person.first bound x {}".format(size),
+          lambda: [bound_entry.person.first for _ in range(size)], size)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,106 @@
+"""
+Benchmark structural equality on 10k-node trees.
+
+Compares `eq_xml` against the recursive implementation it replaced.
+
+Run from the repository root:
+
+    python benchmarks/bench_eq.py
+"""
+from __future__ import print_function
+
+from copy import deepcopy
+from logging import getLogger
+
+from lxml import etree
+
+from lxmlbind.base import eq_xml
+
+from harness import bench
+
+
+NUMBER = 20
+
+
+def eq_xml_recursive(this, that, ignore_attributes=None, ignore_whitespace=True, logger=getLogger("lxmlbind.base")):
+    ignore_attributes = ignore_attributes or []
+    if this.tag != that.tag:
+        if logger is not None:
+            logger.debug("Element tags do not match: {} != {}".format(this.tag, that.tag))
+        return False
+
+    def _get_attributes(attributes):
+        return {key: value for key, value in attributes.items() if key not in ignore_attributes}
+
+    these_attributes = _get_attributes(this.attrib)
+    those_attributes = _get_attributes(that.attrib)
+    if these_attributes != those_attributes:
+        if logger is not None:
+            logger.debug("Element '{}' attributes do not match: {} != {}".format(this.tag,
+                                                                                 these_attributes,
+                                                                                 those_attributes))
+        return False
+
+    def _strip(tail):
+        if tail is None:
+            return None
+        return tail.strip() or None
+
+    this_text = _strip(this.text) if ignore_whitespace else this.text
+    that_text = _strip(that.text) if ignore_whitespace else that.text
+    if this_text != that_text:
+        if logger is not None:
+            logger.debug("Element '{}' text does not match: {} != {}".format(this.tag, this_text, that_text))
+        return False
+
+    this_tail = _strip(this.tail) if ignore_whitespace else this.tail
+    that_tail = _strip(that.tail) if ignore_whitespace else that.tail
+    if this_tail != that_tail:
+        if logger is not None:
+            logger.debug("Element '{}' tails do not match: {} != {}".format(this.tag, this_tail, that_tail))
+        return False
+
+    these_children = sorted(this.getchildren(), key=lambda element: element.tag)
+    those_children = sorted(that.getchildren(), key=lambda element: element.tag)
+    if len(these_children) != len(those_children):
+        if logger is not None:
+            logger.debug("Element '{}' children length does not match: {} != {}".format(this.tag,
+                                                                                        len(these_children),
+                                                                                        len(those_children)))
+        return False
+
+    for this_child, that_child in zip(these_children, those_children):
+        if not eq_xml_recursive(this_child, that_child, ignore_attributes, ignore_whitespace):
+            return False
+    else:
+        return True
+
+
+def build(size):
+    """
+    Build a tree of roughly `size` nodes: records of a type attribute and three fields.
+    """
+    root = etree.Element("people")
+    for index in range(size // 4):
+        person = etree.SubElement(root, "person", type="object")
+        etree.SubElement(person, "first").text = "first{}".format(index)
+        etree.SubElement(person, "last").text = "last{}".format(index)
+        etree.SubElement(person, "age").text = str(index % 100)
+    return root
+
+def main(size=10000):
+    this = build(size)
+    that = deepcopy(this)
+    different = deepcopy(this)
+    different[-1][-1].text = "changed"
+    pretty = etree.XML(etree.tostring(this, pretty_print=True))
+
+    for func in (eq_xml_recursive, eq_xml):
+        assert func(this, that) and func(this, pretty) and not func(this, different)
+        bench("{} equal".format(func.__name__), lambda: func(this, that), NUMBER)
+        bench("{} equal ignoring whitespace".format(func.__name__), lambda: func(this, pretty), NUMBER)
+        bench("{} differ at end".format(func.__name__), lambda: func(this, different), NUMBER)
+
+
+if __name__ == "__main__":
+    main()
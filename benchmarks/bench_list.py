@@ -0,0 +1,92 @@
+"""
+Benchmark iterating a large `List`.
+
+Run from the repository root:
+
+    python benchmarks/bench_list.py [size]
+"""
+from __future__ import print_function
+
+import sys
+
+from lxmlbind.tests.test_address import Address
+from lxmlbind.tests.test_dispatch import MixedList
+from lxmlbind.tests.test_person import Person
+from lxmlbind.tests.test_personlist import PersonList
+
+from harness import measured, timed
+
+
+def main(size):
+    people = PersonList()
+    for index in range(size):
+        people.append(Person(first="first{}".format(index), last="last{}".format(index)))
+    people = PersonList.from_xml(people.to_xml())
+
+    timed("[item.first for item] x {}".format(size), lambda: [person.first for person in people], size)
+    timed("column(Person.first) x {}".format(size), lambda: people.column(Person.first), size)
+
+    def set_each():
+        for person in people:
+            person.last = "last"
+    timed("item.last = ... x {}".format(size), set_each, size)
+    timed("set_column(Person.last) x {}".format(size), lambda: people.set_column(Person.last, ["last"] * size), size)
+
+    timed("iterate {} items".format(size), lambda: sum(1 for _ in people), size)
+    held = timed("list() {} items".format(size), lambda: list(people), size)
+    timed("iterate {} held items".format(size), lambda: sum(1 for _ in people), size)
+    del held
+
+    mixed = MixedList()
+    for index in range(size):
+        mixed.append(Address(city="city{}".format(index)) if index % 10 else Person(first="first"))
+    mixed = MixedList.from_xml(mixed.to_xml())
+    timed("iter_typed(Person) of {} items".format(size), lambda: sum(1 for _ in mixed.iter_typed(Person)), size)
+    timed("isinstance(Person) of {} items".format(size),
+          lambda: sum(1 for item in mixed if isinstance(item, Person)), size)
+
+    shuffled = PersonList.from_xml(people.to_xml())
+    shuffled.set_column(Person.last, ["last{}".format((index * 7919) % size) for index in range(size)])
+    xml = shuffled.to_xml()
+    timed("sorted(key=item.last) of {} items".format(size),
+          lambda: sorted(PersonList.from_xml(xml), key=lambda person: person.last), size)
+    timed("sorted_view(Person.last) of {} items".format(size),
+          lambda: len(PersonList.from_xml(xml).sorted_view(Person.last)), size)
+    timed("sort(key=Person.last) of {} items".format(size),
+          lambda: PersonList.from_xml(xml).sort(key=Person.last), size)
+
+    items = [Person(first="first{}".format(index % 2)) for index in range(size)]
+
+    def append_each():
+        appended = PersonList()
+        for item in items:
+            appended.append(item)
+    timed("append() x {}".format(size), append_each, size)
+    timed("extend() {} items".format(size), lambda: PersonList().extend(items), size)
+
+    # deleting by index is quadratic in lxml; keep it affordable
+    edit_size = min(size, 10000)
+
+    def delete_each():
+        for index in reversed(range(len(edited))):
+            if edited[index].first == "first0":
+                del edited[index]
+    edited = PersonList()
+    edited.extend(Person(first="first{}".format(index % 2)) for index in range(edit_size))
+    xml = edited.to_xml()
+    edited = PersonList.from_xml(xml)
+    timed("del [i] where ... of {} items".format(edit_size), delete_each, edit_size)
+    edited = PersonList.from_xml(xml)
+    timed("remove_where(predicate) of {} items".format(edit_size),
+          lambda: edited.remove_where(lambda person: person.first == "first0"), edit_size)
+    edited = PersonList.from_xml(xml)
+    timed("remove_where(xpath) of {} items".format(edit_size),
+          lambda: edited.remove_where("person[first='first0']"), edit_size)
+
+    held = measured("list() {} items".format(size), lambda: list(people), size)
+    measured("list() {} held items".format(size), lambda: list(people), size)
+    del held
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,37 @@
+"""
+Benchmark the memory held by wrapper instances.
+
+Run from the repository root:
+
+    python benchmarks/bench_memory.py [size]
+"""
+from __future__ import print_function
+
+import sys
+
+from lxml import etree
+
+from lxmlbind.tests.test_person import Person
+from lxmlbind.tests.test_personlist import PersonList
+
+from harness import measured
+
+
+def main(size):
+    element = etree.Element("person")
+    held = measured("Person", lambda: [Person(element) for _ in range(size)], size)
+    del held
+
+    people = PersonList()
+    for index in range(size):
+        people.append(Person(first="first{}".format(index)))
+    people = PersonList.from_xml(people.to_xml())
+    held = measured("list(PersonList) items", lambda: list(people), size)
+    del held
+
+    held = measured("PersonList", lambda: [PersonList(people._element) for _ in range(size)], size)
+    del held
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
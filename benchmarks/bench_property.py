@@ -0,0 +1,48 @@
+"""
+Benchmark `Property` access on the Jenkins metadata classes.
+
+Run from the repository root:
+
+    python benchmarks/bench_property.py
+"""
+from __future__ import print_function
+
+from lxmlbind.api import cached
+from lxmlbind.tests.test_jenkins import MetadataDate
+
+from harness import bench
+
+
+@cached
+class CachedMetadataDate(MetadataDate):
+    pass
+
+
+NUMBER = 100000
+
+
+def bench_class(cls):
+    date = cls()
+    date.name = "time"
+    date.time = 1385409911044
+    date.timezone = "America/Los_Angeles"
+    date.checked = False
+
+    name = cls.__name__
+    bench("get {}.name (name)".format(name), lambda: date.name, NUMBER)
+    bench("get {}.checked (checked)".format(name), lambda: date.checked, NUMBER)
+    bench("get {}.time (value/time)".format(name), lambda: date.time, NUMBER)
+    bench("get {}.timezone (value/timezone)".format(name), lambda: date.timezone, NUMBER)
+
+    def set_time():
+        date.time = 1385409911044
+    bench("set {}.time (value/time)".format(name), set_time, NUMBER)
+
+
+def main():
+    bench_class(MetadataDate)
+    bench_class(CachedMetadataDate)
+
+
+if __name__ == "__main__":
+    main()
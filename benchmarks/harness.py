@@ -0,0 +1,47 @@
+"""
+Measurement helpers shared by the benchmark scripts, so that all results are reported alike.
+"""
+from __future__ import print_function
+
+from time import time
+from timeit import repeat
+
+
+def bench(label, func, number, repeats=5):
+    """
+    Report the best time per call of `func` over `repeats` runs of `number` calls.
+    """
+    best = min(repeat(func, number=number, repeat=repeats))
+    print("{:<50} {:>10.2f} us/op".format(label, best / number * 1e6))
+
+
+def timed(label, func, count):
+    """
+    Report the time taken by a single call of `func`, processing `count` items.
+
+    :returns: the result of `func`
+    """
+    begin = time()
+    result = func()
+    elapsed = time() - begin
+    print("{:<50} {:>8.3f} s {:>10.2f} us/item".format(label, elapsed, elapsed / count * 1e6))
+    return result
+
+
+def measured(label, func, count):
+    """
+    Report the memory held (and peak memory) allocated by a call of `func`, per item of `count`.
+
+    :returns: the result of `func`
+    """
+    # Python 3 only
+    from tracemalloc import get_traced_memory, start, stop
+
+    start()
+    result = func()
+    current, peak = get_traced_memory()
+    stop()
+    print("{:<50} {:>10.1f} bytes/item held {:>10.1f} bytes/item peak".format(label,
+                                                                              current / float(count),
+                                                                              peak / float(count)))
+    return result
@@ -1,4 +1,6 @@
 from lxmlbind.base import Base  # noqa
 from lxmlbind.collections import Dict, List  # noqa
-from lxmlbind.decorators import attributes, key, of, tag  # noqa
-from lxmlbind.property import IntProperty, LongProperty, Property  # noqa
+from lxmlbind.decorators import attributes, cached, hashable, key, nsmap, of, parser_options, tag, weak_parent  # noqa
+from lxmlbind.element import BoundElement, element_class  # noqa
+from lxmlbind.property import (BoolProperty, DateTimeProperty, DecimalProperty, EnumProperty,  # noqa
+                               FloatProperty, IntProperty, LongProperty, Property)
@@ -1,31 +1,66 @@
 """
 Declarative object base class.
 """
-from inspect import getmro
-from logging import getLogger
+from functools import partial
+from logging import DEBUG, getLogger
+from mmap import mmap
+from operator import attrgetter
+from threading import local
+from weakref import ref
 
 from lxml import etree
+from six import add_metaclass
+from six.moves import zip as izip
 
 from lxmlbind.property import Property, set_child
-from lxmlbind.search import search
+from lxmlbind.schema import BaseMeta, get_schema
+from lxmlbind.search import is_attached, materialize, search
 
 
+@add_metaclass(BaseMeta)
 class Base(object):
     """
     Base class for objects using LXML object binding.
+
+    Instances use `__slots__`, which subclasses are given automatically unless they define
+    their own; subclasses needing other instance attributes can use `__slots__ = ("__dict__",)`.
     """
+    __slots__ = ("_element", "_parent_reference", "_cache", "_hash", "_memoized", "_deferred", "__weakref__")
+
     def __init__(self, element=None, parent=None, **kwargs):
         """
+        Wrapping an existing element without property values defers initializing
+        properties until one is written, so that decoding (and reading) does not search
+        for, or add, auto property elements.
+
         :param element: an optional root `lxml.etree` element
         :param parent: an optional parent pointer to another instance of `Base`
         """
         self._parent = parent
+        self._cache = {} if get_schema(self.__class__).cache_elements else None
+        self._hash = None
+        self._memoized = None
         self._init_element(element)
-        self._init_properties(**kwargs)
+        self._deferred = element is not None and not kwargs
+        if not self._deferred:
+            self._init_properties(**kwargs)
+
+    @property
+    def _parent(self):
+        parent = self._parent_reference
+        if type(parent) is ref:
+            return parent()
+        return parent
+
+    @_parent.setter
+    def _parent(self, parent):
+        if parent is not None and get_schema(self.__class__).weak_parent:
+            parent = ref(parent)
+        self._parent_reference = parent
 
     def _init_element(self, element):
         if element is None:
-            self._element = self._create_element(self.__class__._tag())
+            self._element = self._create_element(get_schema(self.__class__).tag)
         elif self.__class__.matches(element):
             self._element = element
         else:
@@ -39,22 +74,42 @@ class Base(object):
 
         Subclasses may override this function to provide more complex default behavior.
         """
-        return etree.Element(tag, self.__class__._attributes())
+        schema = get_schema(self.__class__)
+        return etree.Element(tag, schema.attributes, nsmap=schema.nsmap or None)
 
     def _init_properties(self, **kwargs):
         """
-        Initialize property names and default values.
+        Initialize default values.
+
+        Each property's element is resolved (or created) exactly once; elements without
+        children are populated in a single pass. Property names are resolved when the
+        class is created; see `lxmlbind.schema`.
+        """
+        schema = get_schema(self.__class__)
+        if kwargs:
+            properties = [(name, member) for name, member in schema.properties
+                          if member.auto or name in kwargs]
+        else:
+            properties = schema.auto_properties
+        if not properties:
+            return
+        members = [member for _, member in properties]
+        if len(self._element):
+            elements = (search(self, member, True) for member in members)
+        else:
+            elements = materialize(self, members)
+        for (name, member), element in izip(properties, elements):
+            if member.get_func(element, parent=self) is None:
+                member.set_func(element, kwargs.get(name, member.default), parent=self)
+
+    def _init_deferred(self):
+        """
+        Initialize default values, if deferred when this object was created.
         """
-        for class_ in getmro(self.__class__):
-            for name, member in class_.__dict__.items():
-                if not isinstance(member, Property):
-                    continue
-                if member.path is None:
-                    member.path = name
-                if not member.auto and name not in kwargs:
-                    continue
-                if member.__get__(self, self.__class__) is None:
-                    member.__set__(self, kwargs.get(name, member.default))
+        if self._deferred:
+            self._deferred = False
+            self._init_properties()
+            self._invalidate_hash()
 
     @classmethod
     def _tag(cls):
@@ -74,25 +129,179 @@ class Base(object):
         """
         return {}
 
+    @classmethod
+    def _nsmap(cls):
+        """
+        Defines the namespaces (by prefix) used by objects of this class.
+
+        Prefixed tags (e.g. "soap:Envelope") in the tag of this class and in the paths of its
+        properties are resolved to Clark notation (e.g. "{uri}Envelope") once, so that lookups
+        are simple tag comparisons. Use `None` as the prefix for a default namespace.
+        """
+        return {}
+
+    @classmethod
+    def _parser_options(cls):
+        """
+        Defines options for the `lxml.etree.XMLParser` used to decode objects of this class.
+
+        For example, `remove_blank_text` and `collect_ids=False` reduce parsing time and memory,
+        `huge_tree` allows very large documents, and `resolve_entities=False` hardens parsing.
+        """
+        return {}
+
+    @classmethod
+    def _cache_elements(cls):
+        """
+        Defines whether objects of this class cache the elements resolved for their properties.
+
+        Cached elements are reused for as long as they remain attached at their expected
+        depth; mutations made through this library invalidate the cache.
+        """
+        return False
+
+    @classmethod
+    def _weak_parent(cls):
+        """
+        Defines whether objects of this class hold weak references to their parents.
+
+        Weak references ensure that a parent holding on to its children (e.g. through
+        memoized properties) can still be freed by reference counting alone; however,
+        the parent pointer of a child is cleared once nothing else uses its parent.
+        """
+        return False
+
+    @classmethod
+    def _hash_structure(cls):
+        """
+        Defines whether objects of this class hash by structure, consistently with `__eq__`.
+
+        Structural hashes are computed once and cached; mutations made through this library
+        (to this object or to its children) invalidate the cache.
+        """
+        return False
+
     @classmethod
     def matches(cls, element):
         """
         Check whether element tag matches class definition.
         """
-        return cls._tag() == element.tag
+        return get_schema(cls).tag == element.tag
 
-    def to_xml(self, pretty_print=False):
+    def to_xml(self, pretty_print=False, encoding=None, xml_declaration=None):
         """
         Encode as XML string.
+
+        :param encoding: an optional encoding; the default is ASCII (using character references)
+        :param xml_declaration: whether to include an XML declaration; the default is to do so
+                                only for encodings other than ASCII and UTF-8
+        """
+        return etree.tostring(self._element,
+                              pretty_print=pretty_print,
+                              encoding=encoding,
+                              xml_declaration=xml_declaration)
+
+    def to_file(self, target, pretty_print=False, encoding=None, xml_declaration=None):
+        """
+        Encode as XML directly into a file, without first creating an XML string.
+
+        :param target: a filename or file-like object (such as a caller-provided buffer)
+        """
+        etree.ElementTree(self._element).write(target,
+                                               pretty_print=pretty_print,
+                                               encoding=encoding,
+                                               xml_declaration=xml_declaration)
+
+    @classmethod
+    def from_xml(cls, xml, defer=True, **kwargs):
+        """
+        Decode from an XML string (or any object supporting the buffer protocol).
+
+        :param defer: whether to defer initializing properties until one is written
+        :param kwargs: optional parser options, overriding those of this class
+        """
+        instance = cls(etree.fromstring(xml, cls._get_parser(**kwargs)))
+        if not defer:
+            instance._init_deferred()
+        return instance
+
+    @classmethod
+    def from_file(cls, source, defer=True, **kwargs):
+        """
+        Decode from an XML file.
+
+        Memory-mapped files (and other buffers) are parsed in place; filenames and file-like
+        objects are read incrementally by `lxml` instead of first being read into a string.
+        Byte strings are filenames, as for `lxml`; decode XML byte strings with `from_xml`.
+
+        :param source: a filename, file-like object, `mmap`, or buffer other than a byte string
+        :param defer: whether to defer initializing properties until one is written
+        :param kwargs: optional parser options, overriding those of this class
+        """
+        if isinstance(source, (bytearray, memoryview, mmap)):
+            return cls.from_xml(source, defer, **kwargs)
+        instance = cls(etree.parse(source, cls._get_parser(**kwargs)).getroot())
+        if not defer:
+            instance._init_deferred()
+        return instance
+
+    @classmethod
+    def iter_from_file(cls, source, clear=True):
+        """
+        Decode incrementally from an XML file, yielding each element matching this class.
+
+        Intended for large documents containing many records: unless `clear` is false,
+        each element (and any preceding siblings) is discarded once the next one is
+        requested, so yielded objects should not be used after that point.
+
+        :param source: a filename or file-like object
+        :param clear: whether to discard elements once processed
         """
-        return etree.tostring(self._element, pretty_print=pretty_print)
+        schema = get_schema(cls)
+        for _, element in etree.iterparse(source, events=("end",), tag=schema.tag, **schema.parser_options):
+            yield cls(element)
+            if clear:
+                release(element)
 
     @classmethod
-    def from_xml(cls, xml):
+    def _get_parser(cls, **kwargs):
         """
-        Decode from an XML string.
+        Get a parser for this class, configured with its parser options (overridden by `kwargs`).
         """
-        return cls(etree.XML(xml))
+        options = get_schema(cls).parser_options
+        if kwargs:
+            options = dict(options, **kwargs)
+        return get_parser(**options)
+
+    @classmethod
+    def from_xml_many(cls, xmls, func=None, workers=None, parser=None, chunksize=64):
+        """
+        Decode many XML strings, reusing a parser for each thread.
+
+        With `workers`, strings are decoded by a `concurrent.futures` process pool; since
+        bound objects cannot be returned across processes, each result is `func(instance)`
+        (which must be picklable), defaulting to the re-encoded XML string. The pool
+        submits all of `xmls` up front.
+
+        :param xmls: an iterable of XML strings
+        :param func: an optional function applied to each decoded instance
+        :param workers: an optional number of worker processes
+        :param parser: an optional `lxml.etree.XMLParser`, used instead of one configured
+                       with the parser options of this class when there are no workers
+        :param chunksize: the number of strings sent to a worker process at a time
+        :returns: a generator of instances (or of results of `func`), in order
+        """
+        if workers:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(workers) as executor:
+                for result in executor.map(partial(_decode, cls, func or _encode),
+                                           xmls,
+                                           chunksize=chunksize):
+                    yield result
+        else:
+            for xml in xmls:
+                yield _decode(cls, func, xml, parser)
 
     def search(self, property_, create=False):
         """
@@ -100,13 +309,74 @@ class Base(object):
 
         :param create: whether the property's elements be created if absent
         """
-        return search(self, property_, create)
+        cache = self._cache
+        if cache is None:
+            return search(self, property_, create)
+        element = cache.get(property_)
+        if element is not None and is_attached(element, self._element, len(property_._tags)):
+            return element
+        element = search(self, property_, create)
+        if element is None:
+            cache.pop(property_, None)
+        else:
+            cache[property_] = element
+        return element
+
+    def _invalidate(self, property_=None):
+        """
+        Discard cached state after a mutation.
+
+        :param property_: the mutated property; if omitted, all cached state is discarded
+        """
+        self._invalidate_hash()
+        if self._cache is None:
+            return
+        if property_ is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(property_, None)
+
+    def _get_memoized(self, property_, element):
+        """
+        Get the value of `property_` from `element`, reusing the last value if it came from
+        the same element and its text is unchanged.
+        """
+        memoized = self._memoized
+        if memoized is None:
+            memoized = self._memoized = {}
+        text = element.text
+        entry = memoized.get(property_)
+        if entry is not None and entry[0] is element and entry[1] == text:
+            return entry[2]
+        value = property_.get_func(element, parent=self)
+        memoized[property_] = (element, text, value)
+        return value
+
+    def _forget_memoized(self, property_):
+        """
+        Discard the memoized value of `property_`.
+        """
+        if self._memoized is not None:
+            self._memoized.pop(property_, None)
+
+    def _invalidate_hash(self):
+        """
+        Discard the cached structural hash of this object and of its parents.
+        """
+        instance = self
+        while instance is not None:
+            instance._hash = None
+            instance = instance._parent
 
     def __hash__(self):
         """
-        Hash using XML element.
+        Hash using XML element, or its structure if enabled for this class.
         """
-        return self._element.__hash__()
+        if not get_schema(self.__class__).hash_structure:
+            return self._element.__hash__()
+        if self._hash is None:
+            self._hash = hash_xml(self._element)
+        return self._hash
 
     def __eq__(self, other):
         """
@@ -138,7 +408,7 @@ class Base(object):
         if attributes_func is None:
             attributes_func = lambda instance: cls._attributes()
         if path is None:
-            path = cls._tag()
+            path = get_schema(cls).tag
         return Property(path,
                         get_func=cls,
                         set_func=set_child,
@@ -149,6 +419,94 @@ class Base(object):
                         **kwargs)
 
 
+_parsers = local()
+
+
+def get_parser(**kwargs):
+    """
+    Get an `lxml.etree.XMLParser` for the current thread, configured with `kwargs`.
+
+    Parsers are cached for each distinct configuration.
+    """
+    parsers = getattr(_parsers, "parsers", None)
+    if parsers is None:
+        parsers = _parsers.parsers = {}
+    key = tuple(sorted(kwargs.items()))
+    parser = parsers.get(key)
+    if parser is None:
+        parser = parsers[key] = etree.XMLParser(**kwargs)
+    return parser
+
+
+def _decode(cls, func, xml, parser=None):
+    """
+    Decode an XML string as an instance of `cls`, optionally applying `func` to it.
+    """
+    instance = cls(etree.fromstring(xml, parser or cls._get_parser()))
+    if func is None:
+        return instance
+    return func(instance)
+
+
+def _encode(instance):
+    """
+    Encode an instance as an XML string (picklable, unlike an unbound method on Python 2).
+    """
+    return instance.to_xml()
+
+
+def release(element):
+    """
+    Discard the content of a processed `lxml.etree` element and of its preceding siblings.
+    """
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _strip(text):
+    if text is None:
+        return None
+    return text.strip() or None
+
+
+def _eq_text(this, that, strip):
+    """
+    Compare text (or tails), optionally ignoring surrounding whitespace.
+    """
+    if this == that:
+        return True
+    return strip is not None and strip(this) == strip(that)
+
+
+_get_tag = attrgetter("tag")
+
+
+def hash_xml(element):
+    """
+    Structural hash of an `lxml.etree` element, consistent with `eq_xml` using its default options.
+
+    Like `eq_xml`, the tree is walked iteratively, so that deep trees are supported.
+    """
+    # children are hashed before their parents; hashes are held by element until used
+    hashes = {}
+    stack = [(element, False)]
+    while stack:
+        node, visited = stack.pop()
+        if not visited:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node)
+            continue
+        hashes[node] = hash((node.tag,
+                             frozenset(node.items()),
+                             _strip(node.text),
+                             _strip(node.tail),
+                             tuple(hashes.pop(child) for child in sorted(node, key=_get_tag))))
+    return hashes[element]
+
+
 def eq_xml(this,
            that,
            ignore_attributes=None,
@@ -157,71 +515,77 @@ def eq_xml(this,
     """
     XML comparison on `lxml.etree` elements.
 
+    Children are compared in order of their tags (and then in document order). Elements
+    with identical serializations are equal without further work; otherwise, the trees
+    are walked iteratively, stopping at the first difference. Differences are logged only
+    if `logger` is enabled for debug messages.
+
     :param this: an `lxml.etree` element
     :param that: an `lxml.etree` element
     :param ignore_attributes: an optional list of attributes to ignore
     :param ignore_whitespace: whether whitespace should matter
     """
-    ignore_attributes = ignore_attributes or []
-
-    # compare tags
-    if this.tag != that.tag:
-        if logger is not None:
-            logger.debug("Element tags do not match: {} != {}".format(this.tag, that.tag))
+    debug = logger is not None and logger.isEnabledFor(DEBUG)
+    ignore_attributes = frozenset(ignore_attributes or ())
+    strip = _strip if ignore_whitespace else None
+
+    if etree.tostring(this, with_tail=False) == etree.tostring(that, with_tail=False):
+        # identical serializations; only the tails can differ
+        if _eq_text(this.tail, that.tail, strip):
+            return True
+        if debug:
+            logger.debug("Element '%s' tails do not match: %r != %r", this.tag, this.tail, that.tail)
         return False
 
-    # compare attributes
-    def _get_attributes(attributes):
-        return {key: value for key, value in attributes.items() if key not in ignore_attributes}
-
-    these_attributes = _get_attributes(this.attrib)
-    those_attributes = _get_attributes(that.attrib)
-    if these_attributes != those_attributes:
-        if logger is not None:
-            logger.debug("Element '{}' attributes do not match: {} != {}".format(this.tag,
-                                                                                 these_attributes,
-                                                                                 those_attributes))
-        return False
-
-    # compare text
-    def _strip(tail):
-        if tail is None:
-            return None
-        return tail.strip() or None
+    stack = [(this, that)]
+    while stack:
+        this, that = stack.pop()
 
-    this_text = _strip(this.text) if ignore_whitespace else this.text
-    that_text = _strip(that.text) if ignore_whitespace else that.text
-
-    if this_text != that_text:
-        if logger is not None:
-            logger.debug("Element '{}' text does not match: {} != {}".format(this.tag,
-                                                                             this_text,
-                                                                             that_text))
-        return False
-
-    this_tail = _strip(this.tail) if ignore_whitespace else this.tail
-    that_tail = _strip(that.tail) if ignore_whitespace else that.tail
+        # compare tags
+        if this.tag != that.tag:
+            if debug:
+                logger.debug("Element tags do not match: %s != %s", this.tag, that.tag)
+            return False
 
-    if this_tail != that_tail:
-        if logger is not None:
-            logger.debug("Element '{}' tails do not match: {} != {}".format(this.tag,
-                                                                            this_tail,
-                                                                            that_tail))
-        return False
+        # compare attributes
+        these_attributes = this.items()
+        those_attributes = that.items()
+        if these_attributes != those_attributes or ignore_attributes:
+            these_attributes = dict(these_attributes)
+            those_attributes = dict(those_attributes)
+            for key in ignore_attributes:
+                these_attributes.pop(key, None)
+                those_attributes.pop(key, None)
+            if these_attributes != those_attributes:
+                if debug:
+                    logger.debug("Element '%s' attributes do not match: %s != %s",
+                                 this.tag, these_attributes, those_attributes)
+                return False
+
+        # compare text
+        if not _eq_text(this.text, that.text, strip):
+            if debug:
+                logger.debug("Element '%s' text does not match: %r != %r", this.tag, this.text, that.text)
+            return False
 
-    # evaluate children
-    these_children = sorted(this.getchildren(), key=lambda element: element.tag)
-    those_children = sorted(that.getchildren(), key=lambda element: element.tag)
-    if len(these_children) != len(those_children):
-        if logger is not None:
-            logger.debug("Element '{}' children length does not match: {} != {}".format(this.tag,
-                                                                                        len(these_children),
-                                                                                        len(those_children)))
-        return False
+        if not _eq_text(this.tail, that.tail, strip):
+            if debug:
+                logger.debug("Element '%s' tails do not match: %r != %r", this.tag, this.tail, that.tail)
+            return False
 
-    # recurse
-    for this_child, that_child in zip(these_children, those_children):
-        if not eq_xml(this_child, that_child, ignore_attributes, ignore_whitespace):
+        # evaluate children
+        if len(this) != len(that):
+            if debug:
+                logger.debug("Element '%s' children length does not match: %s != %s",
+                             this.tag, len(this), len(that))
             return False
-    else:
-        return True
+        if not len(this):
+            continue
+        these_children = list(this)
+        those_children = list(that)
+        if list(map(_get_tag, these_children)) != list(map(_get_tag, those_children)):
+            these_children.sort(key=_get_tag)
+            those_children.sort(key=_get_tag)
+        # visit children in order
+        stack.extend(reversed(list(zip(these_children, those_children))))
+    return True
@@ -1,16 +1,223 @@
 """
 Declarative object collection classes.
 """
-from functools import partial
+from __future__ import absolute_import
 
-from six.moves import filter as ifilter
+from array import array
+from collections import OrderedDict
+from weakref import ref
+
+from lxml import etree
+from six import string_types
 from six.moves import map as imap
 from six.moves import zip as izip
 
 from lxmlbind.api import Base
+from lxmlbind.base import release
+from lxmlbind.property import Property, TEXT_CONVERSIONS, TEXT_SETTERS
+from lxmlbind.schema import get_schema
+from lxmlbind.search import find_column
+
 
+class Collection(Base):
+    """
+    Common base for collections of other types.
 
-class List(Base):
+    Keeps a weak identity map from child elements to the instances wrapping them, so
+    that the same element always yields the same instance for as long as it is alive.
+    """
+    __slots__ = ("_wrappers", "_wrappers_limit")
+
+    # minimum size of the identity map before dead references are pruned
+    PRUNE_THRESHOLD = 64
+
+    def __init__(self, *args, **kwargs):
+        self._wrappers = {}
+        self._wrappers_limit = Collection.PRUNE_THRESHOLD
+        super(Collection, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def _of(cls):
+        """
+        Defines what this class is a collection of.
+
+        :returns: a function that operates on `lxml.etree` elements, returning instances of `Base`.
+        """
+        return Base
+
+    @classmethod
+    def iter_to_file(cls, target, items, pretty_print=False):
+        """
+        Encode incrementally to an XML file, writing `items` beneath a root element for this class.
+
+        Items are written one at a time, so `items` may be a generator of any length; the
+        text following each item's element in its own document is not written.
+
+        :param target: a filename or file-like object
+        :param items: an iterable of instances of `Base`
+        """
+        schema = get_schema(cls)
+        with etree.xmlfile(target) as xmlfile:
+            with xmlfile.element(schema.tag, schema.attributes, nsmap=schema.nsmap or None):
+                for item in items:
+                    xmlfile.write(item._element, pretty_print=pretty_print, with_tail=False)
+
+    def column(self, property_, typecode=None, numpy=False):
+        """
+        Get the value of a property for every item in this collection, in bulk.
+
+        The property's path is evaluated across all items at once, and standard text,
+        int and long values are converted without creating any instances. Values are
+        in document order (for `Dict`, this matches `values()` if every item has a key);
+        missing elements give `None`.
+
+        :param property_: a `Property` of the items, e.g. `Person.first`
+        :param typecode: an optional `array.array` typecode (or NumPy dtype) for the values
+        :param numpy: whether to return a NumPy array
+        :returns: a list, `array.array`, or NumPy array
+        """
+        elements = find_column(self._element, property_)
+        get_func = property_.get_func
+        if get_func in TEXT_CONVERSIONS:
+            convert = TEXT_CONVERSIONS[get_func]
+            values = [None if element is None else element.text for element in elements]
+            if convert is not None:
+                values = [None if value is None else convert(value) for value in values]
+        else:
+            values = [None if element is None else get_func(element, parent=self._wrap(child))
+                      for child, element in izip(self._element, elements)]
+        if numpy:
+            import numpy as np
+            return np.array(values, dtype=typecode)
+        if typecode is not None:
+            return array(typecode, values)
+        return values
+
+    def set_column(self, property_, values):
+        """
+        Set the value of a property for every item in this collection, in bulk.
+
+        Existing elements are found across all items at once (see `column`) and updated
+        directly with the property's `set_func`; instances are only created for items that
+        lack the element or for setters that need them.
+
+        Only the property's own element is written: unlike assigning to each item, bulk
+        writes never initialize the default values of items whose initialization was
+        deferred (see `Base.__init__`).
+
+        :param property_: a `Property` of the items, e.g. `Person.first`
+        :param values: an iterable with a value for each item, in document order
+        """
+        values = list(values)
+        if len(values) != len(self._element):
+            raise ValueError("Expected {} values, not {}".format(len(self._element), len(values)))
+        elements = find_column(self._element, property_)
+        set_func = property_.set_func
+        bulk = set_func in TEXT_SETTERS
+        for child, element, value in izip(self._element, elements, values):
+            if bulk and element is not None:
+                set_func(element, value, parent=None)
+                continue
+            item = self._wrap(child)
+            set_func(item.search(property_, create=True), value, parent=item)
+            if property_.memoize:
+                item._forget_memoized(property_)
+        # instances may hash items' structure
+        for reference in list(self._wrappers.values()):
+            item = reference()
+            if item is not None:
+                item._invalidate_hash()
+        self._invalidate()
+
+    def iter_typed(self, *classes):
+        """
+        Iterate over the items whose elements have the tags of `classes`, in document order.
+
+        Elements are selected by tag within `lxml`, so that other elements of large,
+        heterogeneous collections are skipped cheaply.
+
+        :param classes: subclasses of `Base`, e.g. some of those given to `@of`; if omitted,
+                        all of those given to `@of`
+        """
+        if classes:
+            tags = [get_schema(class_).tag for class_ in classes]
+        else:
+            tags = getattr(get_schema(self.__class__).of, "tags", None)
+            if tags is None:
+                raise Exception("'{}' does not dispatch items by tag".format(self.__class__))
+        if not tags:
+            return iter(())
+        return self._iter_wrapped(self._element.iterchildren(*tags))
+
+    def _children(self):
+        """
+        Iterate over child elements, ignoring those with unknown tags if `@of` skips them.
+        """
+        of = get_schema(self.__class__).of
+        if not getattr(of, "skip", False):
+            return self._element.iterchildren()
+        if not of.tags:
+            return iter(())
+        return self._element.iterchildren(*of.tags)
+
+    def _iter_wrapped(self, elements):
+        """
+        Generate the instances wrapping child elements; see `_wrap`.
+        """
+        wrappers = self._wrappers
+        of = get_schema(self.__class__).of
+        for element in elements:
+            reference = wrappers.get(element)
+            item = reference() if reference is not None else None
+            if item is None:
+                item = of(element, parent=self)
+                self._remember(element, item)
+            yield item
+
+    def _wrap(self, element):
+        """
+        Get the instance wrapping a child element, creating it if necessary.
+        """
+        reference = self._wrappers.get(element)
+        item = reference() if reference is not None else None
+        if item is None:
+            item = get_schema(self.__class__).of(element, parent=self)
+            self._remember(element, item)
+        return item
+
+    def _remember(self, element, item):
+        """
+        Add `item` to the identity map.
+
+        Dead references are pruned in bulk, whenever the map has doubled in size since
+        the last pruning; this is considerably cheaper than a `WeakValueDictionary`.
+        """
+        wrappers = self._wrappers
+        if len(wrappers) >= self._wrappers_limit:
+            for key, reference in list(wrappers.items()):
+                if reference() is None:
+                    del wrappers[key]
+            self._wrappers_limit = max(Collection.PRUNE_THRESHOLD, 2 * len(wrappers))
+        wrappers[element] = ref(item)
+
+    def _attach(self, value):
+        """
+        Record `value` as the instance wrapping its element within this collection.
+        """
+        value._parent = self
+        self._remember(value._element, value)
+
+    def _detach(self, element):
+        """
+        Clear the parent pointer of the instance wrapping a removed child element, if any.
+        """
+        reference = self._wrappers.pop(element, None)
+        item = reference() if reference is not None else None
+        if item is not None and item._parent is self:
+            item._parent = None
+
+
+class List(Collection):
     """
     Extension that supports treating elements as list of other types.
 
@@ -25,40 +232,288 @@ class List(Base):
         """
         return Base
 
+    @classmethod
+    def iter_from_file(cls, source, clear=True):
+        """
+        Decode incrementally from an XML file, yielding each item of the list.
+
+        Items are yielded as `_of()` types whose parent is the (partially parsed) list.
+        See `Base.iter_from_file`.
+        """
+        schema = get_schema(cls)
+        func = schema.of
+        tags = frozenset(func.tags) if getattr(func, "skip", False) else None
+        parent = None
+        depth = 0
+        for event, element in etree.iterparse(source, events=("start", "end"), **schema.parser_options):
+            if event == "start":
+                depth += 1
+                if parent is None:
+                    parent = cls(element)
+                continue
+            depth -= 1
+            if depth == 1 and (tags is None or element.tag in tags):
+                yield func(element, parent=parent)
+                if clear:
+                    release(element)
+
     def append(self, value):
         # This maintains ordering
         self._element.append(value._element)
-        value._parent = self
+        self._attach(value)
+        self._invalidate()
+
+    def extend(self, values):
+        """
+        Append each of `values`, moving their elements in a single operation.
+        """
+        values = list(values)
+        self._element.extend([value._element for value in values])
+        for value in values:
+            self._attach(value)
+        self._invalidate()
+
+    def insert(self, index, value):
+        self._element.insert(index, value._element)
+        self._attach(value)
+        self._invalidate()
+
+    def pop(self, index=-1):
+        item = self[index]
+        del self[index]
+        return item
+
+    def remove(self, value):
+        """
+        Remove `value`, which must be an item of this list (not merely equal to one).
+        """
+        if value._element.getparent() is not self._element:
+            raise ValueError("List.remove(x): x not in list")
+        self._element.remove(value._element)
+        self._detach(value._element)
+        self._invalidate()
+
+    def clear(self):
+        """
+        Remove every item, leaving the attributes and text of this list's element alone.
+        """
+        for reference in self._wrappers.values():
+            item = reference()
+            if item is not None and item._parent is self:
+                item._parent = None
+        self._wrappers.clear()
+        del self._element[:]
+        self._invalidate()
+
+    def remove_where(self, condition):
+        """
+        Remove the items matching `condition`, in a single pass over this list's element.
+
+        XPath conditions are evaluated by `lxml` without creating any instances; for example,
+        `remove_where("person[first='John']")`.
+
+        :param condition: an XPath expression (or `etree.XPath`) relative to this list's element,
+                          selecting items to remove, or a predicate on items
+        :returns: the number of items removed
+        """
+        element = self._element
+        if isinstance(condition, string_types):
+            nsmap = get_schema(self.__class__).nsmap
+            matches = element.xpath(condition,
+                                    namespaces={prefix: uri for prefix, uri in nsmap.items() if prefix})
+        elif isinstance(condition, etree.XPath):
+            matches = condition(element)
+        else:
+            matches = [item._element for item in self._iter_wrapped(self._children()) if condition(item)]
+        removed = 0
+        for match in matches:
+            if match.getparent() is element:
+                element.remove(match)
+                self._detach(match)
+                removed += 1
+        if removed:
+            self._invalidate()
+        return removed
+
+    def sort(self, key=None, reverse=False):
+        """
+        Sort the items in place, by moving their elements.
+
+        Keys are extracted once for each item; see `sorted_view`.
+        """
+        elements = list(self._element)
+        order = _sort_elements(self, key, reverse)
+        if len(order) != len(elements):
+            # children with skipped tags keep their positions
+            items = set(order)
+            order = iter(order)
+            order = [next(order) if child in items else child for child in elements]
+        self._element[:] = order
+        self._invalidate()
+
+    def sorted_view(self, key=None, reverse=False):
+        """
+        Get a lazy view of the items in sorted order, leaving this list unchanged.
+
+        The order is computed when the view is first used (and again whenever the items of
+        this list change), extracting keys once for each item: for a `Property` of the items,
+        e.g. `Person.last`, keys are extracted in bulk (see `column`) without creating any
+        instances. Missing values sort last (or first, if reversed). Changes to the keys of
+        items already in the list are not detected.
+
+        :param key: a `Property` of the items, or a function of an item; if omitted, items
+                    are compared directly
+        :param reverse: whether to sort in descending order
+        """
+        return SortedListView(self, key, reverse)
 
     def __getitem__(self, key):
-        func = partial(self.__class__._of(), parent=self)
-        return func(self._element.__getitem__(key))
+        if isinstance(key, slice):
+            return ListView(self, key)
+        return self._wrap(self._element.__getitem__(key))
 
     def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            values = list(value)
+            elements = [value_._element for value_ in values]
+            removed = self._element.__getitem__(key)
+            self._element.__setitem__(key, elements)
+            kept = set(elements)
+            for element in removed:
+                if element not in kept:
+                    self._detach(element)
+            for value_ in values:
+                self._attach(value_)
+            self._invalidate()
+            return
+        element = self._element.__getitem__(key)
         self._element.__setitem__(key, value._element)
-        value._parent = self
+        if element is not value._element:
+            self._detach(element)
+        self._attach(value)
+        self._invalidate()
 
     def __delitem__(self, key):
-        # Without keeping a parallel list of Base instances, it's not
-        # possible to detach the _parent pointer of values added via
-        # append() or __setitem__. So far, not keeping a parallel list
-        # is worth it.
+        if isinstance(key, slice):
+            removed = self._element.__getitem__(key)
+        else:
+            removed = [self._element.__getitem__(key)]
         self._element.__delitem__(key)
+        for element in removed:
+            self._detach(element)
+        self._invalidate()
 
     def __iter__(self):
-        func = partial(self.__class__._of(), parent=self)
-        return imap(func, self._element.__iter__())
+        return self._iter_wrapped(self._children())
 
     def __len__(self):
         return len(self._element)
 
 
-class Dict(Base):
+class ListView(object):
+    """
+    A lazy view of a slice of a `List`.
+
+    Views select items by position each time they are used, so they reflect later changes
+    to the list; items are only wrapped when accessed. Slicing a view gives another view.
+    """
+    __slots__ = ("_list", "_parent", "_slice")
+
+    def __init__(self, parent, slice_):
+        """
+        :param parent: the `List` (or `ListView`) being viewed
+        :param slice_: the `slice` of `parent` to view
+        """
+        self._list = parent if isinstance(parent, List) else parent._list
+        self._parent = parent
+        self._slice = slice_
+
+    def _elements(self):
+        """
+        Get the elements of the viewed items, as a list.
+        """
+        if self._parent is self._list:
+            return self._list._element[self._slice]
+        return self._parent._elements()[self._slice]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return ListView(self, key)
+        return self._list._wrap(self._elements()[key])
+
+    def __iter__(self):
+        return self._list._iter_wrapped(self._elements())
+
+    def __len__(self):
+        return len(self._elements())
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+class SortedListView(ListView):
+    """
+    A lazy view of the items of a `List` in sorted order; see `List.sorted_view`.
+    """
+    __slots__ = ("_key", "_reverse", "_children", "_order")
+
+    def __init__(self, parent, key=None, reverse=False):
+        super(SortedListView, self).__init__(parent, slice(None))
+        self._key = key
+        self._reverse = reverse
+        self._children = None
+        self._order = None
+
+    def _elements(self):
+        children = list(self._list._element)
+        if children != self._children:
+            self._order = _sort_elements(self._list, self._key, self._reverse)
+            self._children = children
+        return self._order
+
+
+def _sort_elements(list_, key, reverse):
+    """
+    Sort the item elements of `list_` (omitting skipped children), extracting each key once.
+    """
+    elements = list(list_._children())
+    if isinstance(key, Property):
+        values = list_.column(key)
+        if len(values) != len(elements):
+            items = set(elements)
+            values = [value for child, value in izip(list_._element, values) if child in items]
+    else:
+        items = list_._iter_wrapped(elements)
+        values = list(items) if key is None else [key(item) for item in items]
+    # missing values sort last, without being compared to others
+    keys = [(value is None, value) for value in values]
+    order = sorted(range(len(elements)), key=keys.__getitem__, reverse=reverse)
+    return [elements[index] for index in order]
+
+
+class Dict(Collection):
     """
     Extension that supports treating elements as dict of types.
 
-    Attempts to maintainer _parent references.
+    Attempts to maintainer _parent references. Lookups, length and iteration use a lazily
+    built index of keys; items whose key is `None` are not part of the dictionary.
+
+    Changes made directly to the element's first or last child are noticed by every
+    operation; changes to other children are noticed by `keys()`, `values()`, `items()`
+    (and their iterators), or after calling `refresh()`.
     """
+    __slots__ = ("_index", "_index_entries", "_index_state", "_index_duplicates")
+
+    def __init__(self, *args, **kwargs):
+        self._index = None
+        self._index_entries = None
+        self._index_state = None
+        self._index_duplicates = False
+        super(Dict, self).__init__(*args, **kwargs)
+
     @classmethod
     def _of(cls):
         """
@@ -88,19 +543,91 @@ class Dict(Base):
         except KeyError:
             return None
 
-    def _find_item(self, key):
+    def _children_ends(self):
+        """
+        Get the first and last children of this dictionary's element, in constant time.
+        """
+        element = self._element
+        try:
+            return (element[0], element[-1])
+        except IndexError:
+            return (None, None)
+
+    def _children_state(self):
+        """
+        Summarize the children of this dictionary's element, to detect changes made behind its back.
+        """
+        return (len(self._element),) + self._children_ends()
+
+    def _item_index(self, verify=False):
+        """
+        Get the key to element index, (re)building it if the element's children changed.
+
+        Alongside the index, the key of every keyed item is kept by element, in document
+        order; see `_item_entries`. Keys are assumed not to change while items
+        remain in the dictionary.
+
+        Counting children is linear in `lxml`, so changes are detected by comparing the
+        first and last children (the count is kept up to date by this dictionary's own
+        changes), unless `verify` is set: then, the number of children is compared as well,
+        so that children added (or removed) directly elsewhere are noticed.
+
+        :param verify: whether to compare the number of children
+        """
+        state = self._index_state
+        if (self._index is None or
+                state[1:] != self._children_ends() or
+                (verify and state[0] != len(self._element))):
+            index = {}
+            entries = OrderedDict()
+            duplicates = False
+            for item in self._iter_wrapped(self._children()):
+                key = self.__class__._key(item)
+                if key is None:
+                    continue
+                child = item._element
+                entries[child] = key
+                if key in index:
+                    duplicates = True
+                else:
+                    index[key] = child
+            self._index = index
+            self._index_entries = entries
+            self._index_duplicates = duplicates
+            self._index_state = self._children_state()
+        return self._index
+
+    def _item_entries(self, verify=False):
+        """
+        Get the keys of keyed items by element, in document order.
+        """
+        self._item_index(verify)
+        return self._index_entries
+
+    def refresh(self):
+        """
+        Rebuild the index of keys if children were changed directly, anywhere in the element.
+        """
+        self._item_index(verify=True)
+
+    def _find_element(self, key):
         if key is None:
             return None
-        func = partial(self.__class__._of(), parent=self)
-        for child in self._element:
-            item = func(child)
-            if self.__class__._key(item) == key:
-                return item
-        else:
+        element = self._item_index().get(key)
+        if element is not None and element.getparent() is not self._element:
+            # removed behind our back; rebuild
+            self._index = None
+            element = self._item_index().get(key)
+        return element
+
+    def _find_item(self, key):
+        element = self._find_element(key)
+        if element is None:
             return None
+        return self._wrap(element)
 
     def __contains__(self, key):
-        return self._find_item(key) is not None
+        return self._find_element(key) is not None
 
     def __getitem__(self, key):
         item = self._find_item(key)
@@ -109,48 +636,66 @@ class Dict(Base):
         return item
 
     def __setitem__(self, key, value):
-        item = self._find_item(key)
-        if item is None:
-            self._element.append(value._element)
-            value._parent = self
+        element = self._find_element(key)
+        index = self._item_index()
+        moved = value._element is not element and value._element.getparent() is self._element
+        if element is not None:
+            self._element.remove(element)
+            del index[key]
+            if element is not value._element:
+                self._detach(element)
+        self._element.append(value._element)
+        self._attach(value)
+        if moved or (element is not None and self._index_duplicates):
+            self._index = None
         else:
-            element_parent = item._element.getparent()
-            element_parent.remove(item._element)
-            element_parent.append(value._element)
-            value._parent = self
+            if element is not None:
+                del self._index_entries[element]
+            value_key = self.__class__._key(value)
+            if value_key is not None:
+                if value_key in index:
+                    self._index_duplicates = True
+                else:
+                    index[value_key] = value._element
+                self._index_entries[value._element] = value_key
+            count = self._index_state[0] + (0 if element is not None else 1)
+            self._index_state = (count,) + self._children_ends()
+        self._invalidate()
 
     def __delitem__(self, key):
-        item = self._find_item(key)
-        if item is None:
+        element = self._find_element(key)
+        if element is None:
             raise KeyError(key)
-        item._element.getparent().remove(item._element)
-        # see comments in List.__delitem__ re: removing _parent linkage
+        self._element.remove(element)
+        self._detach(element)
+        if self._index_duplicates:
+            self._index = None
+        else:
+            del self._index[key]
+            del self._index_entries[element]
+            self._index_state = (self._index_state[0] - 1,) + self._children_ends()
+        self._invalidate()
 
     def iterkeys(self):
-        func = partial(self.__class__._of(), parent=self)
-        return ifilter(None,
-                       imap(self.__class__._key,
-                            imap(func, self._element.__iter__())))
+        return iter(list(self._item_entries(verify=True).values()))
 
     def keys(self):
-        return list(self.iterkeys())
+        return list(self._item_entries(verify=True).values())
 
     def itervalues(self):
-        func = partial(self.__class__._of(), parent=self)
-        return (item for item in imap(func, self._element.__iter__())
-                if self.__class__._key(item) is not None)
+        return imap(self._wrap, list(self._item_entries(verify=True)))
 
     def values(self):
-        return list(self.itervalues())
+        return [self._wrap(element) for element in self._item_entries(verify=True)]
 
     def iteritems(self):
-        return izip(self.iterkeys(), self.itervalues())
+        return ((key, self._wrap(element)) for element, key in list(self._item_entries(verify=True).items()))
 
     def items(self):
-        return list(self.iteritems())
+        return [(key, self._wrap(element)) for element, key in self._item_entries(verify=True).items()]
 
     def __iter__(self):
         return self.iterkeys()
 
     def __len__(self):
-        return len(self._element)
+        return len(self._item_entries())
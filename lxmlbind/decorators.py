@@ -2,6 +2,8 @@
 Declarative object decorators.
 """
 from lxmlbind.api import Base
+from lxmlbind.property import Property
+from lxmlbind.schema import get_schema
 
 
 def tag(name):
@@ -38,23 +40,139 @@ def attributes(**kwargs):
     return wrapper
 
 
-def of(*classes):
+def nsmap(*args, **kwargs):
     """
-    Class decorator that replaces `List.of()` or `Dict.of` with a function that matches classes.
+    Class decorator that replaces `Base._nsmap()` with a function that returns a namespace map.
+
+    Accepts the same arguments as `dict`; a default namespace needs the `None` key, e.g. `nsmap({None: uri})`.
+    """
+    namespaces = dict(*args, **kwargs)
+
+    def wrapper(cls):
+        if not issubclass(cls, Base):
+            raise Exception("lxmlbind.base.nsmap decorator should only be used with subclasses of lxmlbind.base.Base")
+
+        @classmethod
+        def _nsmap(cls):
+            return namespaces
+
+        cls._nsmap = _nsmap
+        # properties defined by this class resolve prefixes in its namespaces
+        for member in cls.__dict__.values():
+            if isinstance(member, Property):
+                member.nsmap = namespaces
+        return cls
+    return wrapper
+
+
+def parser_options(**kwargs):
+    """
+    Class decorator that replaces `Base._parser_options()` with a function that returns `kwargs`.
+    """
+    def wrapper(cls):
+        if not issubclass(cls, Base):
+            raise Exception("lxmlbind.base.parser_options decorator should only be used with subclasses of lxmlbind.base.Base")  # noqa
+
+        @classmethod
+        def _parser_options(cls):
+            return kwargs
+
+        cls._parser_options = _parser_options
+        return cls
+    return wrapper
+
+
+def cached(cls):
     """
+    Class decorator that replaces `Base._cache_elements()` to enable per-instance element caching.
+    """
+    if not issubclass(cls, Base):
+        raise Exception("lxmlbind.base.cached decorator should only be used with subclasses of lxmlbind.base.Base")
+
+    @classmethod
+    def _cache_elements(cls):
+        return True
+
+    cls._cache_elements = _cache_elements
+    return cls
+
+
+def weak_parent(cls):
+    """
+    Class decorator that replaces `Base._weak_parent()` to hold weak references to parents.
+    """
+    if not issubclass(cls, Base):
+        raise Exception("lxmlbind.base.weak_parent decorator should only be used with subclasses of lxmlbind.base.Base")  # noqa
+
+    @classmethod
+    def _weak_parent(cls):
+        return True
+
+    cls._weak_parent = _weak_parent
+    return cls
+
+
+def hashable(cls):
+    """
+    Class decorator that replaces `Base._hash_structure()` to hash instances by structure.
+    """
+    if not issubclass(cls, Base):
+        raise Exception("lxmlbind.base.hashable decorator should only be used with subclasses of lxmlbind.base.Base")
+
+    @classmethod
+    def _hash_structure(cls):
+        return True
+
+    cls._hash_structure = _hash_structure
+    return cls
+
+
+class TagDispatch(object):
+    """
+    Maps elements to classes by their (namespaced) tags; see `of`.
+    """
+    def __init__(self, classes, fallback=None, skip=False):
+        """
+        :param classes: subclasses of `lxmlbind.base.Base`, each with a distinct tag
+        :param fallback: an optional class for elements with other tags
+        :param skip: whether collections ignore elements with other tags when iterating
+        """
+        if fallback is not None and skip:
+            raise Exception("lxmlbind.base.of decorator accepts either a fallback or skip, not both")
+        self.classes = classes
+        self.table = {get_schema(class_).tag: class_ for class_ in classes}
+        self.tags = tuple(self.table)
+        self.fallback = fallback
+        self.skip = skip
+
+    def __call__(self, element, parent=None):
+        class_ = self.table.get(element.tag, self.fallback)
+        if class_ is None:
+            raise Exception("Element tag '{}' does not match any of {}".format(element.tag, list(self.tags)))
+        return class_(element, parent)
+
+
+def of(*classes, **kwargs):
+    """
+    Class decorator that replaces `List.of()` or `Dict.of` with a dispatch table that matches classes.
+
+    Elements are matched by tag; others use the class given as `fallback`, if any, or raise an
+    exception. With `skip=True`, collections instead ignore elements with other tags when iterating
+    (selecting elements by tag within `lxml`); indexing and `len()` of a `List` still see them.
+    """
+    dispatch_kwargs = dict(fallback=kwargs.pop("fallback", None), skip=kwargs.pop("skip", False))
+    if kwargs:
+        raise TypeError("of() got unexpected keyword arguments: {}".format(", ".join(sorted(kwargs))))
+
     def wrapper(cls):
         if not issubclass(cls, Base):
             raise Exception("lxmlbind.base.of decorator should only be used with subclasses of lxmlbind.base.Base")
 
-        tag_to_class = {
-            class_._tag(): class_ for class_ in classes
-        }
+        dispatch = TagDispatch(classes, **dispatch_kwargs)
 
         @classmethod
         def _of(cls):
-            def for_tag(element, parent=None):
-                return tag_to_class[element.tag](element, parent)
-            return for_tag
+            return dispatch
 
         cls._of = _of
         return cls
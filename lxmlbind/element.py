@@ -0,0 +1,225 @@
+"""
+Binding by custom `lxml` element classes.
+
+Instead of wrapping elements in instances of `Base`, subclasses of `Base` can be
+compiled to `lxml.etree.ElementBase` subclasses with the same properties. Parsers
+configured with a lookup for these classes return bound elements directly, so that
+child objects and collection items need no wrappers at all.
+"""
+from copy import copy
+from mmap import mmap
+from threading import local
+
+from lxml import etree
+
+from lxmlbind.base import Base
+from lxmlbind.schema import get_schema
+from lxmlbind.search import search
+
+
+class BoundElement(etree.ElementBase):
+    """
+    Base class for element classes generated by `element_class`.
+
+    Bound elements are proxies created (and discarded) by `lxml` at need, so they hold no
+    state beyond the tree itself: element caching, memoization and structural hashing do
+    not apply, and the parent of an object is its parent element. Collections are ordinary
+    elements whose children are bound; `lxml` reserves `get()`, `keys()` and `items()` for
+    attributes, so `Dict` lookups by key are not provided.
+    """
+    # the subclass of `Base` this class was generated from
+    _bound = None
+    _deferred = False
+    _cache = None
+
+    @property
+    def _element(self):
+        return self
+
+    @property
+    def _parent(self):
+        return self.getparent()
+
+    @_parent.setter
+    def _parent(self, parent):
+        # implied by the tree
+        pass
+
+    @classmethod
+    def create(cls, **kwargs):
+        """
+        Create a new element, initializing its properties as `Base` does.
+
+        The element belongs to a document using this class's lookup, so that its
+        children (including ones appended later) are bound as well.
+        """
+        schema = get_schema(cls)
+        element = get_element_parser(cls._bound).makeelement(schema.tag,
+                                                             schema.attributes,
+                                                             nsmap=schema.nsmap or None)
+        element._init_properties(**kwargs)
+        return element
+
+    @classmethod
+    def from_xml(cls, xml, **kwargs):
+        """
+        Decode from an XML string (or any object supporting the buffer protocol).
+
+        :param kwargs: optional parser options, overriding those of the bound class
+        """
+        return cls._check(etree.fromstring(xml, get_element_parser(cls._bound, **kwargs)))
+
+    @classmethod
+    def from_file(cls, source, **kwargs):
+        """
+        Decode from an XML file.
+
+        :param source: a filename, file-like object, `mmap`, or buffer other than a byte string
+                       (byte strings are filenames; see `Base.from_file`)
+        :param kwargs: optional parser options, overriding those of the bound class
+        """
+        if isinstance(source, (bytearray, memoryview, mmap)):
+            return cls.from_xml(source, **kwargs)
+        return cls._check(etree.parse(source, get_element_parser(cls._bound, **kwargs)).getroot())
+
+    @classmethod
+    def _check(cls, element):
+        if not isinstance(element, cls):
+            raise Exception("'{}' object requires tag '{}', not '{}'".format(cls._bound,
+                                                                             cls._bound._tag(),
+                                                                             element.tag))
+        return element
+
+    def search(self, property_, create=False):
+        """
+        Search for property with instance.
+
+        :param create: whether the property's elements be created if absent
+        """
+        return search(self, property_, create)
+
+    def _init_deferred(self):
+        pass
+
+    def _invalidate(self, property_=None):
+        pass
+
+    def _invalidate_hash(self):
+        pass
+
+    def _get_memoized(self, property_, element):
+        return property_.get_func(element, parent=self)
+
+    def _forget_memoized(self, property_):
+        pass
+
+    _init_properties = Base.__dict__["_init_properties"]
+    to_xml = Base.__dict__["to_xml"]
+    to_file = Base.__dict__["to_file"]
+
+
+def _get_element(element, parent):
+    """
+    Get a child object, which is bound by the lookup already.
+    """
+    return element
+
+
+def _is_bound(value):
+    return isinstance(value, type) and issubclass(value, Base) and value is not Base
+
+
+def element_class(cls):
+    """
+    Get (or generate) the element class for a subclass of `Base`.
+
+    The element class has copies of the properties of `cls`, except that child objects
+    are returned as their (bound) elements rather than wrapped; it is regenerated
+    whenever `cls` changes. Properties may not shadow element members (e.g. `text`).
+    """
+    schema = get_schema(cls)
+    if schema.element_class is not None:
+        return schema.element_class
+    namespace = {"__module__": cls.__module__, "_bound": cls, "TAG": schema.tag}
+    properties = []
+    for name, member in schema.properties:
+        if hasattr(BoundElement, name):
+            raise Exception("'{}' property '{}' conflicts with element attribute".format(cls, name))
+        if _is_bound(member.get_func):
+            member = copy(member)
+            member.get_func = _get_element
+        namespace[name] = member
+        properties.append((name, member))
+    element_schema = copy(schema)
+    element_schema.properties = tuple(properties)
+    element_schema.auto_properties = tuple((name, member) for name, member in properties if member.auto)
+    namespace["_compiled_schema"] = element_schema
+    schema.element_class = type("{}Element".format(cls.__name__), (BoundElement,), namespace)
+    return schema.element_class
+
+
+def _bound_classes(cls):
+    """
+    Generate `cls` and the subclasses of `Base` reachable from it through properties and `_of()`.
+    """
+    seen = set()
+    pending = [cls]
+    while pending:
+        class_ = pending.pop()
+        if class_ in seen:
+            continue
+        seen.add(class_)
+        yield class_
+        schema = get_schema(class_)
+        pending.extend(member.get_func for _, member in schema.properties if _is_bound(member.get_func))
+        if _is_bound(schema.of):
+            pending.append(schema.of)
+        else:
+            pending.extend(getattr(schema.of, "classes", ()))
+
+
+def get_lookup(cls):
+    """
+    Get (or create) an `lxml` element class lookup for `cls` and the classes reachable from it.
+
+    Classes are registered by (namespaced) tag; elements with other tags are not bound.
+    """
+    schema = get_schema(cls)
+    if schema.lookup is not None:
+        return schema.lookup
+    lookup = etree.ElementNamespaceClassLookup()
+    bound = {}
+    for class_ in _bound_classes(cls):
+        tag = get_schema(class_).tag
+        if tag in bound and bound[tag] is not class_:
+            raise Exception("'{}' and '{}' both bind tag '{}'".format(bound[tag], class_, tag))
+        bound[tag] = class_
+        uri, _, local = tag[1:].rpartition("}") if tag.startswith("{") else (None, None, tag)
+        lookup.get_namespace(uri)[local] = element_class(class_)
+    schema.lookup = lookup
+    return lookup
+
+
+_parsers = local()
+
+
+def get_element_parser(cls, **kwargs):
+    """
+    Get an `lxml.etree.XMLParser` for the current thread that returns bound elements for `cls`.
+
+    Parsers are configured with the parser options of `cls` (overridden by `kwargs`) and
+    cached for each distinct configuration.
+    """
+    parsers = getattr(_parsers, "parsers", None)
+    if parsers is None:
+        parsers = _parsers.parsers = {}
+    options = get_schema(cls).parser_options
+    if kwargs:
+        options = dict(options, **kwargs)
+    lookup = get_lookup(cls)
+    key = (lookup, tuple(sorted(options.items())))
+    parser = parsers.get(key)
+    if parser is None:
+        parser = parsers[key] = etree.XMLParser(**options)
+        parser.set_element_class_lookup(lookup)
+    return parser
@@ -3,12 +3,49 @@ Declarative object properties that map to `lxml.etree` content.
 """
 
 import sys
+from datetime import datetime
+from decimal import Decimal
+from re import compile as compile_regex
 
 # Python 3 got rid of `long` so we need to create it here.
 if sys.version_info >= (3, 0):
     long = int
 
 
+# path steps, which may use Clark notation ("{uri}local") for namespaced tags
+_PATH_STEP = compile_regex(r"\{[^}]*\}[^/]*|[^/]+")
+
+
+def split_path(path):
+    """
+    Split a '/' deliminated path into tags.
+    """
+    if "{" not in path:
+        return path.split("/")
+    return _PATH_STEP.findall(path)
+
+
+def resolve_tag(tag, nsmap):
+    """
+    Resolve a (possibly prefixed) tag to Clark notation using `nsmap`.
+
+    Tags already in Clark notation, and tags with unknown prefixes, are returned as is.
+    Unprefixed tags are placed in the default (`None`) namespace, if any.
+    """
+    if not nsmap or tag.startswith("{"):
+        return tag
+    prefix, _, local = tag.rpartition(":")
+    if prefix:
+        uri = nsmap.get(prefix)
+        if uri is None:
+            return tag
+    else:
+        uri = nsmap.get(None)
+        if uri is None:
+            return tag
+    return "{{{}}}{}".format(uri, local)
+
+
 def get_text(element, parent):
     return element.text
 
@@ -25,6 +62,53 @@ def get_long(element, parent):
     return long(element.text)
 
 
+def get_float(element, parent):
+    if element.text is None:
+        return None
+    return float(element.text)
+
+
+def get_decimal(element, parent):
+    if element.text is None:
+        return None
+    return Decimal(element.text)
+
+
+_BOOLEANS = {
+    "true": True,
+    "1": True,
+    "false": False,
+    "0": False,
+}
+
+
+def to_bool(text):
+    """
+    Convert an XML Schema boolean ("true", "false", "1" or "0").
+    """
+    try:
+        return _BOOLEANS[text.strip()]
+    except KeyError:
+        raise ValueError("invalid literal for boolean: '{}'".format(text))
+
+
+def get_bool(element, parent):
+    if element.text is None:
+        return None
+    return to_bool(element.text)
+
+
+# bulk conversions of element text for standard getters; see `lxmlbind.collections`
+TEXT_CONVERSIONS = {
+    get_text: None,
+    get_int: int,
+    get_long: long,
+    get_float: float,
+    get_decimal: Decimal,
+    get_bool: to_bool,
+}
+
+
 def set_text(element, value, parent):
     if value is None:
         element.text = None
@@ -32,6 +116,24 @@ def set_text(element, value, parent):
         element.text = str(value)
 
 
+def set_float(element, value, parent):
+    if value is None:
+        element.text = None
+    else:
+        element.text = repr(float(value))
+
+
+def set_bool(element, value, parent):
+    if value is None:
+        element.text = None
+    else:
+        element.text = "true" if value else "false"
+
+
+# setters that do not use their parent; see `lxmlbind.collections`
+TEXT_SETTERS = frozenset([set_text, set_float, set_bool])
+
+
 def set_child(element, value, parent):
     if value is not None:
         # replace existing element with assigned one
@@ -39,6 +141,7 @@ def set_child(element, value, parent):
         element_parent.remove(element)
         element_parent.append(value._element)
         value._parent = parent
+        parent._invalidate()
 
 
 class Property(object):
@@ -53,6 +156,7 @@ class Property(object):
                  filter_func=None,
                  auto=False,
                  default=None,
+                 memoize=False,
                  **kwargs):
         """
         Create a property using an XPath-like expression that designates a specific
@@ -66,30 +170,87 @@ class Property(object):
         :param filter_func: a function to filter/search for this property witin parent's elements
         :param auto: whether this property will be automatically created
         :param default: default value to use
+        :param memoize: whether to cache the output of `get_func` for each object, for as long
+                        as its element's text is unchanged (intended for typed properties)
         :param kwargs: optional attributes applied to newly created leaf element on __set__
         """
+        self._nsmap = None
         self.path = path
         self.get_func = get_func
         self.set_func = set_func
         self.auto = auto
         self.default = default
+        self.memoize = memoize
         self.filter_func = filter_func
         self.attributes_func = attributes_func
         self.attributes = kwargs
 
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        self._path = path
+        self._resolve_tags()
+
+    @property
+    def nsmap(self):
+        return self._nsmap
+
+    @nsmap.setter
+    def nsmap(self, nsmap):
+        """
+        Set the namespace map used to resolve prefixed tags in the path.
+        """
+        self._nsmap = nsmap
+        self._resolve_tags()
+
+    def _resolve_tags(self):
+        if self._path is None:
+            self._tags = None
+        else:
+            self._tags = tuple(resolve_tag(tag, self._nsmap) for tag in split_path(self._path))
+        # compiled lazily by `lxmlbind.search`
+        self._resolver = None
+        self._column = None
+
+    @property
+    def filter_func(self):
+        return self._filter_func
+
+    @filter_func.setter
+    def filter_func(self, filter_func):
+        self._filter_func = filter_func
+        self._resolver = None
+        self._column = None
+
     @property
     def tags(self):
-        return self.path.split("/")
+        return list(self._tags)
 
     def __get__(self, instance, owner):
         """
         Provide read access to an XML element (based on the property's path) as an object attribute.
+
+        Auto properties of objects whose initialization was deferred read as their default
+        when their element is missing (or has no value), without creating it; child objects
+        are the exception, since they are written through.
         """
         if instance is None:
             return self
+        if self.auto and instance._deferred and self.set_func is not set_child:
+            element = instance.search(self, create=False)
+            value = None if element is None else self._get_value(instance, element)
+            return self.default if value is None else value
         element = instance.search(self, create=self.auto)
         if element is None:
             return None
+        return self._get_value(instance, element)
+
+    def _get_value(self, instance, element):
+        if self.memoize:
+            return instance._get_memoized(self, element)
         return self.get_func(element, parent=instance)
 
     def __set__(self, instance, value):
@@ -98,18 +259,26 @@ class Property(object):
 
         If the element does not exist, it will be created (as will any missing parent elements).
         """
+        instance._init_deferred()
         element = instance.search(self, create=True)
         self.set_func(element, value, parent=instance)
+        instance._invalidate_hash()
+        if self.memoize:
+            instance._forget_memoized(self)
 
     def __delete__(self, instance):
         """
         Provide delete access to an XML element (based on the property's path) as an object attribute.
         """
+        instance._init_deferred()
         element = instance.search(self)
         if element is None:
             raise AttributeError("'{}' object has no attribute '{}'".format(instance.__class__, self.path))
         if element.getparent() is not None:
             element.getparent().remove(element)
+            instance._invalidate()
+            if self.memoize:
+                instance._forget_memoized(self)
         else:
             raise Exception("Cannot detach root element")
 
@@ -140,3 +309,106 @@ class LongProperty(Property):
                                            set_func=set_func,
                                            *args,
                                            **kwargs)
+
+
+class FloatProperty(Property):
+    def __init__(self,
+                 path=None,
+                 get_func=get_float,
+                 set_func=set_float,
+                 *args,
+                 **kwargs):
+        super(FloatProperty, self).__init__(path=path,
+                                            get_func=get_func,
+                                            set_func=set_func,
+                                            *args,
+                                            **kwargs)
+
+
+class DecimalProperty(Property):
+    def __init__(self,
+                 path=None,
+                 get_func=get_decimal,
+                 set_func=set_text,
+                 *args,
+                 **kwargs):
+        super(DecimalProperty, self).__init__(path=path,
+                                              get_func=get_func,
+                                              set_func=set_func,
+                                              *args,
+                                              **kwargs)
+
+
+class BoolProperty(Property):
+    def __init__(self,
+                 path=None,
+                 get_func=get_bool,
+                 set_func=set_bool,
+                 *args,
+                 **kwargs):
+        super(BoolProperty, self).__init__(path=path,
+                                           get_func=get_func,
+                                           set_func=set_func,
+                                           *args,
+                                           **kwargs)
+
+
+class DateTimeProperty(Property):
+    """
+    A property holding a `datetime`, formatted with `strftime`/`strptime`.
+    """
+    def __init__(self,
+                 path=None,
+                 format="%Y-%m-%dT%H:%M:%S",
+                 *args,
+                 **kwargs):
+        def get_datetime(element, parent):
+            if element.text is None:
+                return None
+            return datetime.strptime(element.text, format)
+
+        def set_datetime(element, value, parent):
+            if value is None:
+                element.text = None
+            else:
+                element.text = value.strftime(format)
+
+        self.format = format
+        super(DateTimeProperty, self).__init__(path=path,
+                                               get_func=get_datetime,
+                                               set_func=set_datetime,
+                                               *args,
+                                               **kwargs)
+
+
+class EnumProperty(Property):
+    """
+    A property holding a member of an `Enum`, represented by its value.
+    """
+    def __init__(self,
+                 enum,
+                 path=None,
+                 *args,
+                 **kwargs):
+        members = {str(member.value): member for member in enum}
+
+        def get_enum(element, parent):
+            if element.text is None:
+                return None
+            try:
+                return members[element.text]
+            except KeyError:
+                raise ValueError("'{}' is not a valid {}".format(element.text, enum.__name__))
+
+        def set_enum(element, value, parent):
+            if value is None:
+                element.text = None
+            else:
+                element.text = str(enum(value).value)
+
+        self.enum = enum
+        super(EnumProperty, self).__init__(path=path,
+                                           get_func=get_enum,
+                                           set_func=set_enum,
+                                           *args,
+                                           **kwargs)
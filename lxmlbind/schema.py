@@ -0,0 +1,128 @@
+"""
+Per-class compiled property schema.
+"""
+from inspect import getmro
+
+from lxmlbind.property import Property, resolve_tag
+
+
+class Schema(object):
+    """
+    Compiled description of the properties bound by a class.
+
+    Schemas are built once per class (on first use) and discarded whenever the class
+    (or one of its bases) is modified, so that object construction does not need to
+    walk the class hierarchy.
+    """
+    def __init__(self, cls):
+        """
+        :param cls: a subclass of `lxmlbind.base.Base`
+        """
+        self.nsmap = cls._nsmap()
+        self.tag = _resolve(cls, resolve_tag(cls._tag(), self.nsmap))
+        self.attributes = cls._attributes()
+        self.parser_options = cls._parser_options()
+        self.cache_elements = cls._cache_elements()
+        self.hash_structure = cls._hash_structure()
+        self.weak_parent = cls._weak_parent()
+        self.properties = tuple(_find_properties(cls))
+        for name, property_ in self.properties:
+            if property_.path is None:
+                # declared by a class other than a subclass of `Base` (e.g. a mixin)
+                _bind_property(cls, property_, name)
+            if property_._tags is not None:
+                for tag in property_._tags:
+                    _resolve(cls, tag)
+        self.auto_properties = tuple((name, property_)
+                                     for name, property_ in self.properties
+                                     if property_.auto)
+        self.names = frozenset(name for name, _ in self.properties)
+        of = getattr(cls, "_of", None)
+        self.of = of() if of is not None else None
+        # generated lazily by `lxmlbind.element`
+        self.element_class = None
+        self.lookup = None
+
+
+def _resolve(cls, tag):
+    """
+    Ensure that any namespace prefix of `tag` has been resolved.
+    """
+    if not tag.startswith("{") and ":" in tag:
+        raise Exception("'{}' uses unknown namespace prefix in '{}'".format(cls, tag))
+    return tag
+
+
+def _find_properties(cls):
+    """
+    Generate (name, property) pairs for `cls` in method resolution order.
+
+    Properties redefined by a subclass shadow those of its bases.
+    """
+    seen = set()
+    for class_ in getmro(cls):
+        for name, member in class_.__dict__.items():
+            if not isinstance(member, Property) or name in seen:
+                continue
+            seen.add(name)
+            yield name, member
+
+
+def get_schema(cls):
+    """
+    Get (or compile) the schema for `cls`.
+    """
+    schema = cls.__dict__.get("_compiled_schema")
+    if schema is None:
+        schema = Schema(cls)
+        type.__setattr__(cls, "_compiled_schema", schema)
+    return schema
+
+
+def _bind_property(cls, property_, name):
+    """
+    Resolve the path (and namespaces) of a property assigned to a class attribute.
+    """
+    if property_.path is None:
+        property_.path = name
+    if property_.nsmap is None:
+        property_.nsmap = cls._nsmap()
+
+
+def _invalidate(cls):
+    """
+    Discard compiled schemas for `cls` and all of its subclasses.
+    """
+    if cls.__dict__.get("_compiled_schema") is not None:
+        type.__setattr__(cls, "_compiled_schema", None)
+    for subclass in type.__subclasses__(cls):
+        _invalidate(subclass)
+
+
+class BaseMeta(type):
+    """
+    Metaclass that binds property names at class creation and keeps schemas current.
+
+    Classes that do not define `__slots__` are given empty slots, so that their instances
+    keep the compact layout of `Base`.
+    """
+    def __new__(mcs, name, bases, namespace):
+        if "__slots__" not in namespace:
+            namespace = dict(namespace, __slots__=())
+        return super(BaseMeta, mcs).__new__(mcs, name, bases, namespace)
+
+    def __init__(cls, name, bases, namespace):
+        super(BaseMeta, cls).__init__(name, bases, namespace)
+        for attr, member in namespace.items():
+            if isinstance(member, Property):
+                _bind_property(cls, member, attr)
+
+    def __setattr__(cls, name, value):
+        if isinstance(value, Property):
+            _bind_property(cls, value, name)
+        super(BaseMeta, cls).__setattr__(name, value)
+        _invalidate(cls)
+
+    def __delattr__(cls, name):
+        super(BaseMeta, cls).__delattr__(name)
+        _invalidate(cls)
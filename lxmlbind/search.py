@@ -1,21 +1,188 @@
 """
 Property search support.
 """
+from functools import partial
 from logging import getLogger as get_logger
+from re import compile as compile_regex
 
 from lxml import etree
 from six.moves import filter as ifilter
 
 
+# tags that can be used verbatim as XPath name tests
+_XPATH_NAME = compile_regex(r"^[A-Za-z_][A-Za-z0-9_.-]*$")
+
+
 def search(instance, property_, create):
     """
     Search `lxml.etree` rooted at `instance._element` for the child
     element matching `property_.tags`.
     """
+    resolver = property_._resolver
+    if resolver is None:
+        resolver = property_._resolver = compile_path(property_)
+    element = resolver(instance._element)
+    if element is not None or not create:
+        return element
     parent = _search_parent(instance, property_, create)
-    if parent is None:
+    return _search_child(parent, property_._tags[-1], instance, property_, create, terminal=True)
+
+
+def is_attached(element, root, depth):
+    """
+    Check whether `element` is still attached `depth` levels beneath `root`.
+    """
+    for _ in range(depth):
+        element = element.getparent()
+        if element is None:
+            return False
+    return element is root
+
+
+def compile_path(property_):
+    """
+    Compile a function that finds the element for `property_` beneath a given element.
+
+    Plain (or namespaced) tag paths are evaluated by lxml, using `iterchildren` for single
+    tags and a cached `etree.XPath` otherwise; only a terminal `filter_func` is evaluated
+    in Python.
+    """
+    tags = property_._tags
+    if property_.filter_func is not None:
+        return partial(_find_filtered, tags[:-1], property_.filter_func)
+    if len(tags) == 1:
+        return partial(_find_child, tags[0])
+    xpath = _compile_xpath(tags)
+    if xpath is None:
+        return partial(_find_path, tags)
+    return partial(_find_xpath, xpath)
+
+
+def compile_column(property_):
+    """
+    Compile a function that finds the element for `property_` beneath each child of a given element.
+
+    Paths are evaluated for all children at once by a cached `etree.XPath` where possible.
+    """
+    xpath = None
+    if property_.filter_func is None:
+        xpath = _compile_xpath(property_._tags, "*/")
+    if xpath is None:
+        resolver = property_._resolver
+        if resolver is None:
+            resolver = property_._resolver = compile_path(property_)
+        return partial(_find_each, resolver)
+    return partial(_find_xpath_each, xpath, len(property_._tags))
+
+
+def find_column(element, property_):
+    """
+    Find the element matching `property_` beneath each child of `element`.
+
+    :returns: a list with an element (or `None`) for each child
+    """
+    column = property_._column
+    if column is None:
+        column = property_._column = compile_column(property_)
+    return column(element)
+
+
+def _compile_xpath(tags, prefix=""):
+    """
+    Compile an `etree.XPath` matching the first element at each step of `tags`.
+
+    Namespaced tags (in Clark notation) are given generated prefixes.
+
+    :returns: the XPath, or `None` if some tag cannot be expressed as an XPath name test
+    """
+    steps = []
+    namespaces = {}
+    for tag in tags:
+        uri, _, local = tag[1:].rpartition("}") if tag.startswith("{") else ("", "", tag)
+        if not _XPATH_NAME.match(local):
+            return None
+        if uri:
+            local = "{}:{}".format(namespaces.setdefault(uri, "ns{}".format(len(namespaces))), local)
+        steps.append("{}[1]".format(local))
+    return etree.XPath(prefix + "/".join(steps),
+                       namespaces={prefix_: uri for uri, prefix_ in namespaces.items()})
+
+
+def _find_child(tag, element):
+    for child in element.iterchildren(tag):
+        return child
+    return None
+
+
+def _find_path(tags, element):
+    for tag in tags:
+        element = _find_child(tag, element)
+        if element is None:
+            return None
+    return element
+
+
+def _find_xpath(xpath, element):
+    for match in xpath(element):
+        return match
+    return None
+
+
+def _find_each(resolver, element):
+    return [resolver(child) for child in element]
+
+
+def _find_xpath_each(xpath, depth, element):
+    matches = xpath(element)
+    if len(matches) == len(element):
+        # every child has exactly one match, in document order
+        return matches
+    found = {}
+    for match in matches:
+        child = match
+        for _ in range(depth):
+            child = child.getparent()
+        found[child] = match
+    return [found.get(child) for child in element]
+
+
+def _find_filtered(tags, filter_func, element):
+    element = _find_path(tags, element)
+    if element is None:
         return None
-    return _search_child(parent, property_.tags[-1], instance, property_, create, terminal=True)
+    return next(ifilter(filter_func, element), None)
+
+
+def materialize(instance, properties):
+    """
+    Create the elements for `properties` beneath `instance._element` in a single pass.
+
+    Intended for elements without children: plain paths are created directly instead of
+    being searched for, sharing parent elements between paths with a common prefix.
+
+    :returns: a generator of the element for each property, in order
+    """
+    created = {}
+    for property_ in properties:
+        tags = property_._tags
+        if property_.filter_func is not None:
+            # custom filters may match elements created so far; search for them
+            element = search(instance, property_, True)
+            child = element
+            for index in range(len(tags), 0, -1):
+                created.setdefault(tags[:index], child)
+                child = child.getparent()
+            yield element
+            continue
+        element = instance._element
+        for index, tag in enumerate(tags, 1):
+            child = created.get(tags[:index])
+            if child is None:
+                terminal = index == len(tags)
+                attributes = _attributes_func(property_, tag, terminal)(instance)
+                child = created[tags[:index]] = _create_child(tag, element, attributes)
+            element = child
+        yield element
 
 
 def _search_parent(instance, property_, create):
@@ -23,7 +190,7 @@ def _search_parent(instance, property_, create):
     Search for the parent element of `property_`.
     """
     element = instance._element
-    for tag in property_.tags[:-1]:
+    for tag in property_._tags[:-1]:
         element = _search_child(element, tag, instance, property_, create)
         if element is None:
             return None
@@ -31,18 +198,6 @@ def _search_parent(instance, property_, create):
         return element
 
 
-def _filter_func(property_, tag, terminal):
-    """
-    Determine the filtering function for selecting child elements.
-
-    The logic for the terminal element is allowed to be customized.
-    """
-    if terminal and property_.filter_func is not None:
-        return property_.filter_func
-    else:
-        return lambda element: element.tag == tag
-
-
 def _attributes_func(property_, tag, terminal):
     """
     Determine the attributes generating function for creating child elements.
@@ -59,22 +214,21 @@ def _attributes_func(property_, tag, terminal):
 
 def _search_child(element, tag, instance, property_, create, terminal=False):
     """
-    Search for a child element matching filter_func.
+    Search for a child element matching `tag` (or the property's filter_func, if terminal).
     """
-    try:
-        # using next/ifilter allows comparable behavior to element.find(tag),
-        # but with greater flexibility
-        return next(ifilter(_filter_func(property_, tag, terminal), element))
-    except StopIteration:
-        if not create:
-            return None
-        attributes = _attributes_func(property_, tag, terminal)(instance)
-        return _create_child(tag, element, attributes)
+    if terminal and property_.filter_func is not None:
+        child = next(ifilter(property_.filter_func, element), None)
+    else:
+        child = _find_child(tag, element)
+    if child is not None or not create:
+        return child
+    attributes = _attributes_func(property_, tag, terminal)(instance)
+    return _create_child(tag, element, attributes)
 
 
 def _create_child(tag, parent, attributes):
     """
     Create child element.
     """
-    get_logger("lxmlbind.base").debug("Creating element '{}' for '{}'".format(tag, parent.tag))
+    get_logger("lxmlbind.base").debug("Creating element '%s' for '%s'", tag, parent.tag)
     return etree.SubElement(parent, tag, attrib=attributes)
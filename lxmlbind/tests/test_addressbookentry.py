@@ -1,8 +1,10 @@
+from array import array
 from textwrap import dedent
 
-from nose.tools import eq_
+from nose import SkipTest
+from nose.tools import assert_raises, eq_, ok_
 
-from lxmlbind.api import Base
+from lxmlbind.api import Base, List, of, Property, tag
 from lxmlbind.tests.test_address import Address
 from lxmlbind.tests.test_person import Person
 
@@ -55,3 +57,119 @@ def test_nested_types():
     eq_(entry2.address.state, "DC")
     eq_(entry2.address.zip_code, 20500)
     eq_(entry1, entry2)
+
+
+@tag("addresses")
+@of(Address, AddressBookEntry)
+class AddressList(List):
+    """
+    Example using column extraction.
+    """
+    pass
+
+
+def test_address_column():
+    """
+    Test bulk extraction of property values.
+    """
+    addresses = AddressList()
+    for number in [1600, 10, None]:
+        address = Address(city="Springfield")
+        if number is not None:
+            address.street_number = number
+        addresses.append(address)
+
+    eq_(addresses.column(Address.city), ["Springfield", "Springfield", "Springfield"])
+    eq_(addresses.column(Address.street_number), [1600, 10, None])
+    eq_(addresses.column(Address.street_number)[:2], [address.street_number for address in addresses][:2])
+
+    del addresses[-1]
+    eq_(addresses.column(Address.zip_code), [None, None])
+    eq_(addresses.column(Address.street_number, typecode="l"), array("l", [1600, 10]))
+
+    # other getters are applied to each item
+    entry = AddressBookEntry()
+    entry.person.first = "John"
+    addresses.append(entry)
+    people = addresses.column(AddressBookEntry.person)
+    eq_(people[:2], [None, None])
+    eq_(people[2].first, "John")
+    eq_(people[2]._parent, entry)
+
+
+def test_address_column_numpy():
+    """
+    Test bulk extraction into NumPy arrays.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise SkipTest("NumPy is not installed")
+    addresses = AddressList()
+    for number in [1600, 10]:
+        addresses.append(Address(street_number=number))
+    column = addresses.column(Address.street_number, typecode="int64", numpy=True)
+    ok_(isinstance(column, numpy.ndarray))
+    eq_(column.tolist(), [1600, 10])
+
+
+def test_address_set_column():
+    """
+    Test bulk assignment of property values.
+    """
+    addresses = AddressList()
+    addresses.append(Address(street_number=1600))
+    addresses.append(Address(city="Springfield"))
+    address = addresses[0]
+
+    addresses.set_column(Address.street_number, [10, 20])
+    eq_(addresses.column(Address.street_number), [10, 20])
+    eq_(address.street_number, 10)
+    eq_(addresses[1].street_number, 20)
+
+    addresses.set_column(Address.city, ["Washington", None])
+    eq_(addresses.column(Address.city), ["Washington", None])
+
+    entry = AddressBookEntry()
+    addresses.append(entry)
+    addresses.set_column(AddressBookEntry.person, [None, None, Person(first="John")])
+    eq_(entry.person.first, "John")
+
+    with assert_raises(ValueError):
+        addresses.set_column(Address.city, ["Washington"])
+
+
+class Kinded(Base):
+    """
+    Example with a default value.
+    """
+    kind = Property(auto=True, default="k")
+    name = Property()
+
+
+@tag("kinds")
+@of(Kinded)
+class KindedList(List):
+    """
+    Example list of items with default values.
+    """
+    pass
+
+
+def test_set_column_deferred():
+    """
+    Bulk assignment never initializes the default values of deferred items.
+    """
+    xml = "<kinds><kinded><name>a</name></kinded><kinded/></kinds>"
+    kinds = KindedList.from_xml(xml)
+    kinded = kinds[0]
+    kinds.set_column(Kinded.name, ["x", "y"])
+    eq_(kinds.column(Kinded.name), ["x", "y"])
+    eq_(kinds.column(Kinded.kind), [None, None])
+    ok_(kinded._deferred)
+
+    # unlike assigning to each item
+    kinds = KindedList.from_xml(xml)
+    for item, name in zip(kinds, ["x", "y"]):
+        item.name = name
+    eq_(kinds.column(Kinded.kind), ["k", "k"])
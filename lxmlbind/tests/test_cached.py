@@ -0,0 +1,93 @@
+from nose.tools import eq_, ok_
+
+from lxmlbind.api import Base, cached, List, Property, tag
+from lxmlbind.tests.test_person import Person
+
+
+@cached
+class CachedEntry(Base):
+    """
+    Example using per-instance element caching.
+    """
+    name = Property("value/name")
+    person = Person.property()
+
+
+@cached
+@tag("cached-list")
+class CachedList(List):
+    """
+    Example using element caching with a collection.
+    """
+    first = Property("person/first")
+
+
+def test_cached_reads():
+    """
+    Resolved elements are cached and reused.
+    """
+    entry = CachedEntry.from_xml("<cachedEntry><value><name>foo</name></value></cachedEntry>")
+    eq_(entry.name, "foo")
+    element = entry._cache[CachedEntry.name]
+    eq_(element.text, "foo")
+
+    element.text = "bar"
+    eq_(entry.name, "bar")
+    ok_(entry._cache[CachedEntry.name] is element)
+
+
+def test_cached_delete():
+    """
+    Deleting a property invalidates cached elements beneath it.
+    """
+    entry = CachedEntry.from_xml("<cachedEntry><value><name>foo</name></value></cachedEntry>")
+    eq_(entry.name, "foo")
+    del entry.name
+    eq_(entry.name, None)
+    ok_(CachedEntry.name not in entry._cache)
+
+    entry.name = "bar"
+    eq_(entry.name, "bar")
+
+
+def test_cached_detached():
+    """
+    Elements detached behind the cache's back are not returned.
+    """
+    entry = CachedEntry.from_xml("<cachedEntry><value><name>foo</name></value></cachedEntry>")
+    eq_(entry.name, "foo")
+    entry._element.remove(entry._element[0])
+    eq_(entry.name, None)
+
+
+def test_cached_set_child():
+    """
+    Replacing a child object invalidates the cache.
+    """
+    entry = CachedEntry()
+    entry.person.first = "John"
+    person = Person(first="Jane")
+    entry.person = person
+    eq_(entry.person.first, "Jane")
+    ok_(entry._cache[CachedEntry.person] is person._element)
+
+
+def test_cached_collection():
+    """
+    Collection mutators invalidate the cache.
+    """
+    people = CachedList()
+    eq_(people.first, None)
+    people.append(Person(first="John"))
+    eq_(people.first, "John")
+    people[0] = Person(first="Jane")
+    eq_(people.first, "Jane")
+    del people[0]
+    eq_(people.first, None)
+
+
+def test_uncached():
+    """
+    Classes do not cache elements by default.
+    """
+    ok_(Person()._cache is None)
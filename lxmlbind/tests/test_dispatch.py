@@ -0,0 +1,155 @@
+from io import BytesIO
+
+from nose.tools import assert_raises, eq_, ok_
+from six import b
+
+from lxmlbind.api import Base, Dict, key, List, nsmap, of, tag
+from lxmlbind.tests.test_address import Address
+from lxmlbind.tests.test_namespaces import ATOM, Entry
+from lxmlbind.tests.test_person import Person
+
+
+class Unknown(Base):
+    """
+    Example fallback for unknown tags.
+    """
+    @classmethod
+    def matches(cls, element):
+        return True
+
+
+@tag("mixed")
+@of(Person, Address)
+class MixedList(List):
+    """
+    Example dispatching items by tag.
+    """
+    pass
+
+
+@tag("mixed")
+@of(Person, fallback=Unknown)
+class FallbackList(List):
+    """
+    Example dispatching unknown tags to a fallback class.
+    """
+    pass
+
+
+@tag("mixed")
+@of(Person, skip=True)
+class SkipList(List):
+    """
+    Example skipping unknown tags.
+    """
+    pass
+
+
+@tag("mixed")
+@of(Person, skip=True)
+@key(lambda item: item.first)
+class SkipDict(Dict):
+    """
+    Example skipping unknown tags in a dictionary.
+    """
+    pass
+
+
+@nsmap({None: ATOM})
+@tag("feed")
+@of(Entry, skip=True)
+class SkipFeed(List):
+    """
+    Example skipping unknown namespaced tags.
+    """
+    pass
+
+
+MIXED = b("""<mixed><person><first>John</first></person><address><city>Washington</city></address>"""
+          """<other/><person><first>Jane</first></person></mixed>""")
+
+
+def test_dispatch():
+    """
+    Items are dispatched by tag; unknown tags raise an exception.
+    """
+    mixed = MixedList.from_xml(MIXED)
+    eq_(type(mixed[0]), Person)
+    eq_(type(mixed[1]), Address)
+    with assert_raises(Exception) as capture:
+        list(mixed)
+    eq_(str(capture.exception), "Element tag 'other' does not match any of ['person', 'address']")
+
+
+def test_fallback():
+    """
+    Unknown tags may be dispatched to a fallback class.
+    """
+    eq_([type(item) for item in FallbackList.from_xml(MIXED)], [Person, Unknown, Unknown, Person])
+
+
+def test_skip():
+    """
+    Unknown tags may be skipped when iterating.
+    """
+    people = SkipList.from_xml(MIXED)
+    eq_([person.first for person in people], ["John", "Jane"])
+    eq_(len(people), 4)
+    ok_(list(people)[1] is people[3])
+
+    people = SkipDict.from_xml(MIXED)
+    eq_(people.keys(), ["John", "Jane"])
+    eq_(len(people), 2)
+
+    people = list(SkipList.iter_from_file(BytesIO(MIXED), clear=False))
+    eq_([person.first for person in people], ["John", "Jane"])
+
+    feed = SkipFeed.from_xml(b("""<feed xmlns="{}"><entry><title>hello</title></entry>"""
+                               """<x:entry xmlns:x="urn:other"/></feed>""".format(ATOM)))
+    eq_([entry.title for entry in feed], ["hello"])
+
+
+def test_skip_remove_where():
+    """
+    Predicates given to `remove_where` are only applied to items with known tags.
+    """
+    people = SkipList.from_xml(MIXED)
+    eq_(people.remove_where(lambda person: person.first == "John"), 1)
+    eq_([person.first for person in people], ["Jane"])
+    eq_([child.tag for child in people._element], ["address", "other", "person"])
+
+
+def test_skip_sort():
+    """
+    Sorting orders items with known tags and leaves skipped children in place.
+    """
+    for key in (lambda person: person.first, Person.first):
+        people = SkipList.from_xml(MIXED)
+        eq_([person.first for person in people.sorted_view(key=key)], ["Jane", "John"])
+        people.sort(key=key)
+        eq_([person.first for person in people], ["Jane", "John"])
+        eq_([child.tag for child in people._element], ["person", "address", "other", "person"])
+
+
+def test_iter_typed():
+    """
+    Items may be selected by class.
+    """
+    mixed = MixedList.from_xml(MIXED)
+    eq_([person.first for person in mixed.iter_typed(Person)], ["John", "Jane"])
+    eq_([type(item) for item in mixed.iter_typed()], [Person, Address, Person])
+    ok_(next(mixed.iter_typed(Address)) is mixed[1])
+
+    with assert_raises(Exception) as capture:
+        list(List().iter_typed())
+    eq_(str(capture.exception), "'<class 'lxmlbind.collections.List'>' does not dispatch items by tag")
+
+
+def test_of_arguments():
+    """
+    Fallback and skip are exclusive.
+    """
+    with assert_raises(Exception):
+        of(Person, fallback=Unknown, skip=True)(List)
+    with assert_raises(TypeError):
+        of(Person, skipped=True)
@@ -0,0 +1,127 @@
+from nose.tools import assert_raises, eq_, ok_
+from six import b
+
+from lxmlbind.api import BoundElement, element_class, Property, tag
+from lxmlbind.base import eq_xml
+from lxmlbind.tests.test_addressbookentry import AddressBookEntry
+from lxmlbind.tests.test_keydict import Ignore, KeyDict
+from lxmlbind.tests.test_namespaces import Entry, Feed, Message
+from lxmlbind.tests.test_person import Person
+from lxmlbind.tests.test_personlist import PersonList
+
+
+def test_element_class():
+    """
+    Element classes are generated once per class, with the same properties.
+    """
+    PersonElement = element_class(Person)
+    ok_(issubclass(PersonElement, BoundElement))
+    ok_(element_class(Person) is PersonElement)
+    eq_(PersonElement.__name__, "PersonElement")
+
+    person = PersonElement.create(first="John")
+    ok_(isinstance(person, PersonElement))
+    ok_(person._element is person)
+    eq_(person.first, "John")
+    person.last = "Doe"
+    eq_(person.to_xml(), b("""<person type="object"><first>John</first><last>Doe</last></person>"""))
+    del person.last
+    eq_(person.last, None)
+
+    # and equivalent to an instance of `Person`
+    ok_(eq_xml(person, Person(first="John")._element))
+
+    with assert_raises(Exception) as capture:
+        PersonElement.from_xml("<mismatched/>")
+    eq_(str(capture.exception),
+        "'<class 'lxmlbind.tests.test_person.Person'>' object requires tag 'person', not 'mismatched'")
+
+
+def test_element_class_regenerated():
+    """
+    Element classes reflect changes to the class they were generated from.
+    """
+    @tag("changing")
+    class Changing(Person):
+        pass
+
+    first_class = element_class(Changing)
+    Changing.middle = Property()
+    second_class = element_class(Changing)
+    ok_(first_class is not second_class)
+    eq_(second_class.create(middle="Q").middle, "Q")
+
+
+def test_nested_elements():
+    """
+    Child objects are bound elements, not wrappers.
+    """
+    xml = b("""<addressBookEntry><person type="object"><first>John</first></person>"""
+            """<address><zipCode>20500</zipCode></address></addressBookEntry>""")
+    entry = element_class(AddressBookEntry).from_xml(xml)
+    ok_(isinstance(entry.person, element_class(Person)))
+    ok_(entry.person._parent is entry)
+    eq_(entry.person.first, "John")
+    eq_(entry.address.zip_code, 20500)
+
+    # assigning a child object replaces its element
+    entry.person = element_class(Person).create(first="Jane")
+    eq_(entry.person.first, "Jane")
+    eq_(len(entry.findall("person")), 1)
+
+    # as do new auto properties
+    entry = element_class(AddressBookEntry).create()
+    ok_(isinstance(entry.person, element_class(Person)))
+    entry.person.first = "John"
+    eq_(entry.person.first, "John")
+
+
+def test_list_elements():
+    """
+    List items are bound elements, including items appended later.
+    """
+    PersonElement = element_class(Person)
+    people = element_class(PersonList).from_xml(
+        b("""<person-list><person><first>John</first></person><person><first>Jane</first></person></person-list>"""))
+    eq_([person.first for person in people], ["John", "Jane"])
+    ok_(all(isinstance(person, PersonElement) for person in people))
+    ok_(people[0]._parent is people)
+
+    people.append(PersonElement.create(first="Joe"))
+    people.append(Person(first="Jim")._element)
+    eq_([person.first for person in people], ["John", "Jane", "Joe", "Jim"])
+    ok_(all(isinstance(person, PersonElement) for person in people))
+
+
+def test_dict_elements():
+    """
+    Dict items are bound by each of the `of()` classes.
+    """
+    key_dict = KeyDict()
+    key_dict.add(Person(first="John"))
+    key_dict["ignore"] = Ignore()
+
+    elements = element_class(KeyDict).from_xml(key_dict.to_xml())
+    eq_([type(item) for item in elements], [element_class(Person), element_class(Ignore)])
+    eq_({KeyDict._key(item): item.tag for item in elements}, {"John": "person", None: "ignore"})
+
+
+def test_namespaced_elements():
+    """
+    Namespaced tags are bound by namespace.
+    """
+    feed = Feed()
+    feed.append(Entry(title="hello"))
+    feed = element_class(Feed).from_xml(feed.to_xml())
+    eq_([type(entry) for entry in feed], [element_class(Entry)])
+    eq_(feed[0].title, "hello")
+
+
+def test_conflicting_elements():
+    """
+    Properties may not shadow element attributes.
+    """
+    with assert_raises(Exception) as capture:
+        element_class(Message)
+    eq_(str(capture.exception),
+        "'<class 'lxmlbind.tests.test_namespaces.Message'>' property 'text' conflicts with element attribute")
@@ -0,0 +1,108 @@
+from lxml import etree
+from nose.tools import eq_, ok_
+
+from lxmlbind.api import attributes, Base, hashable, List, of, Property, tag
+from lxmlbind.base import eq_xml, hash_xml
+from lxmlbind.tests.test_person import Person
+
+
+@hashable
+@tag("person")
+@attributes(type="object")
+class HashablePerson(Person):
+    """
+    Example using structural hashing.
+    """
+    pass
+
+
+@hashable
+class HashableEntry(Base):
+    """
+    Example using structural hashing with a child object.
+    """
+    name = Property()
+    person = HashablePerson.property()
+
+
+@hashable
+@tag("people")
+@of(HashablePerson)
+class HashableList(List):
+    """
+    Example using structural hashing with a collection.
+    """
+    pass
+
+
+def test_hashable_dedupe():
+    """
+    Equal objects hash equally, so that sets can deduplicate them.
+    """
+    people = [HashablePerson(first="John", last="Smith"),
+              HashablePerson.from_xml("<person type='object'>\n  <last>Smith</last>\n  <first>John</first>\n</person>"),
+              HashablePerson(first="Jane", last="Doe")]
+    eq_(hash(people[0]), hash(people[1]))
+    eq_(len(set(people)), 2)
+
+
+def test_hashable_invalidation():
+    """
+    Mutations invalidate cached hashes, including those of parents.
+    """
+    person = HashablePerson(first="John")
+    other = HashablePerson(first="Jane")
+    ok_(hash(person) != hash(other))
+    person.first = "Jane"
+    eq_(hash(person), hash(other))
+
+    entry = HashableEntry(name="entry")
+    before = hash(entry)
+    entry.person.first = "John"
+    ok_(hash(entry) != before)
+    eq_(hash(entry), hash(HashableEntry.from_xml(entry.to_xml())))
+
+    people = HashableList()
+    before = hash(people)
+    people.append(person)
+    ok_(hash(people) != before)
+    person.last = "Doe"
+    eq_(hash(people), hash(HashableList.from_xml(people.to_xml())))
+
+
+def test_hashable_equality():
+    """
+    Equality does not depend on cached hashes, which other wrappers may have made stale.
+    """
+    entry = HashableEntry(name="entry")
+    person = entry.person
+    other = HashablePerson(first="Jane")
+    hash(person)
+    hash(other)
+    entry.person.first = "Jane"
+    ok_(person == other)
+
+
+def test_hashable_deep():
+    """
+    Deep trees are hashed without recursion.
+    """
+    def deep():
+        root = etree.Element("root")
+        element = root
+        for _ in range(5000):
+            element = etree.SubElement(element, "child")
+        element.text = "leaf"
+        return root
+
+    eq_(hash_xml(deep()), hash_xml(deep()))
+    ok_(eq_xml(deep(), deep()))
+
+
+def test_unhashable():
+    """
+    Classes hash by identity by default.
+    """
+    person1 = Person(first="John")
+    person2 = Person(first="John")
+    ok_(hash(person1) != hash(person2))
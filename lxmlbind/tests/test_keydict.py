@@ -1,4 +1,4 @@
-from nose.tools import assert_raises, eq_
+from nose.tools import assert_raises, eq_, ok_
 
 from lxmlbind.api import Base, Dict, of, tag, key
 from lxmlbind.tests.test_person import Person
@@ -57,6 +57,128 @@ def test_empty_key():
     eq_(key_dict.values(), [])
     eq_(key_dict.items(), [])
 
-    eq_(len(key_dict), 2)
+    # unkeyed items are kept, but are not part of the dictionary
+    eq_(len(key_dict), 0)
+    eq_(len(key_dict._element), 2)
     with assert_raises(KeyError):
         key_dict[None]
+
+
+def test_key_order():
+    """
+    Ensure that keys, values and items agree with each other, in document order.
+    """
+    key_dict = KeyDict()
+    people = [Person(first=first) for first in ["John", "Jane", "Joe"]]
+    for person in people:
+        key_dict.add(person)
+    key_dict.add(Ignore())
+
+    eq_(len(key_dict), 3)
+    eq_(key_dict.keys(), ["John", "Jane", "Joe"])
+    eq_(list(key_dict), key_dict.keys())
+    ok_(all(value is person for value, person in zip(key_dict.values(), people)))
+    eq_(key_dict.items(), list(zip(key_dict.keys(), key_dict.values())))
+    eq_(list(key_dict.iteritems()), key_dict.items())
+
+    # replaced items move to the end
+    key_dict["John"] = Person(first="John", last="Doe")
+    eq_(key_dict.keys(), ["Jane", "Joe", "John"])
+    del key_dict["Joe"]
+    eq_(key_dict.keys(), ["Jane", "John"])
+    eq_(len(key_dict), 2)
+
+    # as seen by a new instance
+    eq_(KeyDict.from_xml(key_dict.to_xml()).keys(), ["Jane", "John"])
+
+
+def test_replace_key():
+    """
+    Ensure that setting an existing key replaces its item.
+    """
+    key_dict = KeyDict()
+    key_dict.add(Person(first="John", last="Smith"))
+    key_dict.add(Person(first="Jane", last="Doe"))
+
+    person = Person(first="John", last="Doe")
+    key_dict["John"] = person
+
+    eq_(len(key_dict), 2)
+    eq_(key_dict["John"], person)
+    eq_(key_dict["John"].last, "Doe")
+    eq_(key_dict["Jane"].last, "Doe")
+
+
+def test_external_changes():
+    """
+    Ensure that lookups see changes made directly to the underlying element.
+    """
+    key_dict = KeyDict()
+    key_dict.add(Person(first="John", last="Smith"))
+    key_dict.add(Person(first="Jane", last="Doe"))
+    ok_("John" in key_dict)
+
+    # removed behind the dict's back
+    key_dict._element.remove(key_dict._element[0])
+    ok_("John" not in key_dict)
+    eq_(key_dict["Jane"].last, "Doe")
+
+    # appended behind the dict's back
+    key_dict._element.append(Person(first="Jim", last="Jones")._element)
+    eq_(key_dict["Jim"].last, "Jones")
+
+    # replaced behind the dict's back
+    key_dict._element[0] = Person(first="Joan", last="Smith")._element
+    ok_("Jane" not in key_dict)
+    eq_(key_dict["Joan"].last, "Smith")
+
+
+def test_external_middle_changes():
+    """
+    Ensure that iteration, and lookups after `refresh()`, see changes made directly to middle children.
+    """
+    key_dict = KeyDict()
+    for first in ["John", "Jane", "Joe"]:
+        key_dict.add(Person(first=first))
+    eq_(len(key_dict), 3)
+
+    # inserted behind the dict's back
+    key_dict._element.insert(1, Person(first="Jim")._element)
+    key_dict.refresh()
+    ok_("Jim" in key_dict)
+    key_dict["Jim"] = Person(first="Jim", last="Jones")
+    eq_(key_dict.keys(), ["John", "Jane", "Joe", "Jim"])
+    eq_(key_dict["Jim"].last, "Jones")
+
+    # removed behind the dict's back
+    key_dict._element.remove(key_dict._element[1])
+    eq_(key_dict.keys(), ["John", "Joe", "Jim"])
+    eq_(len(key_dict), 3)
+    eq_([item.first for item in key_dict.values()], ["John", "Joe", "Jim"])
+
+    key_dict._element.insert(1, Person(first="Jill")._element)
+    eq_(key_dict.items()[1][0], "Jill")
+    eq_(len(key_dict), 4)
+
+
+def test_add_without_counting():
+    """
+    Ensure that adding items, lookups and length do not count the element's children.
+    """
+    class CountingDict(KeyDict):
+        counts = []
+
+        def _children_state(self):
+            self.counts.append(None)
+            return super(CountingDict, self)._children_state()
+
+    key_dict = CountingDict()
+    for index in range(5000):
+        key_dict.add(Person(first="first{}".format(index)))
+    ok_("first0" in key_dict)
+    ok_("missing" not in key_dict)
+    eq_(len(key_dict), 5000)
+    eq_(len(CountingDict.counts), 1)
+
+    eq_(len(key_dict.keys()), 5000)
+    eq_(key_dict.keys()[-1], "first4999")
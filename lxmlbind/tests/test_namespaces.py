@@ -0,0 +1,131 @@
+from io import BytesIO
+
+from nose.tools import assert_raises, eq_, ok_
+
+from lxmlbind.api import Base, List, nsmap, of, Property, tag
+from lxmlbind.schema import get_schema
+
+
+SOAP = "http://schemas.xmlsoap.org/soap/envelope/"
+ATOM = "http://www.w3.org/2005/Atom"
+
+
+@nsmap(m="urn:example:message")
+@tag("m:message")
+class Message(Base):
+    """
+    Example using a namespaced tag.
+    """
+    text = Property("m:text")
+
+
+@nsmap(soap=SOAP, m="urn:example:message")
+@tag("soap:Envelope")
+class Envelope(Base):
+    """
+    Example using namespaced property paths.
+    """
+    action = Property("soap:Header/m:action")
+    message = Message.property("soap:Body/m:message")
+
+
+@nsmap({None: ATOM})
+@tag("entry")
+class Entry(Base):
+    """
+    Example using a default namespace.
+    """
+    title = Property()
+
+
+@nsmap({None: ATOM})
+@tag("feed")
+@of(Entry)
+class Feed(List):
+    """
+    Example using a default namespace with a collection.
+    """
+    pass
+
+
+def test_clark_notation():
+    """
+    Prefixes are resolved once, to Clark notation.
+    """
+    eq_(get_schema(Envelope).tag, "{%s}Envelope" % SOAP)
+    eq_(Envelope.action.tags, ["{%s}Header" % SOAP, "{urn:example:message}action"])
+    eq_(Entry.title.tags, ["{%s}title" % ATOM])
+    eq_(Entry.title.path, "title")
+
+
+def test_namespaced_properties():
+    """
+    Namespaced elements are created, and found, by property.
+    """
+    envelope = Envelope()
+    envelope.action = "send"
+    envelope.message.text = "hello"
+    eq_(envelope, Envelope.from_xml('<soap:Envelope xmlns:m="urn:example:message" xmlns:soap="%s">'
+                                    '<soap:Header><m:action>send</m:action></soap:Header>'
+                                    '<soap:Body><m:message><m:text>hello</m:text></m:message></soap:Body>'
+                                    '</soap:Envelope>' % SOAP))
+    ok_(b"<soap:Body><m:message><m:text>hello</m:text></m:message></soap:Body>" in envelope.to_xml())
+
+    parsed = Envelope.from_xml('<e:Envelope xmlns:e="%s" xmlns:x="urn:example:message">'
+                               '<e:Body><x:message><x:text>hi</x:text></x:message></e:Body>'
+                               '<Body/></e:Envelope>' % SOAP)
+    eq_(parsed.message.text, "hi")
+    eq_(parsed.action, None)
+
+    with assert_raises(Exception):
+        Envelope.from_xml("<Envelope/>")
+
+
+def test_default_namespace():
+    """
+    Unprefixed tags use the default namespace, if any.
+    """
+    feed = Feed.from_xml('<feed xmlns="%s"><entry><title>one</title></entry><entry/></feed>' % ATOM)
+    eq_([entry.title for entry in feed], ["one", None])
+    ok_(Entry.matches(feed._element[0]))
+
+    feed.append(Entry(title="two"))
+    eq_(feed[-1].title, "two")
+
+
+@nsmap(a=ATOM)
+@tag("a:people")
+@of(Message)
+class People(List):
+    """
+    Example using a prefixed namespace with a collection.
+    """
+    pass
+
+
+def test_namespaced_iter_to_file():
+    """
+    Incremental encoding uses the namespaces of the collection.
+    """
+    output = BytesIO()
+    People.iter_to_file(output, [Message(text="hello")])
+    people = People()
+    people.append(Message(text="hello"))
+    eq_(output.getvalue(), people.to_xml())
+    ok_(output.getvalue().startswith(('<a:people xmlns:a="%s">' % ATOM).encode("ascii")))
+
+    output = BytesIO()
+    Feed.iter_to_file(output, [Entry(title="one")])
+    ok_(output.getvalue().startswith(('<feed xmlns="%s">' % ATOM).encode("ascii")))
+    eq_([entry.title for entry in Feed.from_xml(output.getvalue())], ["one"])
+
+
+def test_unknown_prefix():
+    """
+    Unknown prefixes are reported when the class is first used.
+    """
+    class Unknown(Base):
+        value = Property("x:value")
+
+    with assert_raises(Exception):
+        Unknown()
@@ -0,0 +1,60 @@
+from io import BytesIO
+
+from lxml import etree
+from nose.tools import eq_, ok_
+
+from lxmlbind.api import parser_options, tag
+from lxmlbind.base import get_parser
+from lxmlbind.tests.test_person import Person
+from lxmlbind.tests.test_personlist import PersonList
+
+
+@parser_options(remove_blank_text=True)
+@tag("person")
+class CompactPerson(Person):
+    """
+    Example using custom parser options.
+    """
+    pass
+
+
+@parser_options(remove_blank_text=True)
+@tag("person-list")
+class CompactPersonList(PersonList):
+    """
+    Example using custom parser options with a collection.
+    """
+    pass
+
+
+XML = b"<person>\n  <first>John</first>\n</person>"
+
+
+def test_parser_options():
+    """
+    Parser options may be configured for a class, or for a call.
+    """
+    eq_(Person.from_xml(XML).to_xml(), XML)
+    eq_(CompactPerson.from_xml(XML).to_xml(), b"<person><first>John</first></person>")
+    eq_(Person.from_xml(XML, remove_blank_text=True).to_xml(), b"<person><first>John</first></person>")
+    eq_(CompactPerson.from_xml(XML, remove_blank_text=False).to_xml(), XML)
+    eq_(list(CompactPerson.from_xml_many([XML]))[0].to_xml(), b"<person><first>John</first></person>")
+
+
+def test_parser_options_iter_from_file():
+    """
+    Parser options apply to incremental decoding.
+    """
+    xml = b"<person-list>\n  " + XML + b"\n</person-list>"
+    person = next(CompactPersonList.iter_from_file(BytesIO(xml), clear=False))
+    eq_(person.first, "John")
+    eq_(person._parent.to_xml(), b"<person-list><person><first>John</first></person></person-list>")
+
+
+def test_get_parser():
+    """
+    Parsers are cached for each configuration.
+    """
+    ok_(isinstance(get_parser(), etree.XMLParser))
+    ok_(get_parser(huge_tree=True, remove_blank_text=True) is get_parser(remove_blank_text=True, huge_tree=True))
+    ok_(get_parser(huge_tree=True) is not get_parser())
@@ -1,3 +1,10 @@
+# -*- coding: utf-8 -*-
+from io import BytesIO
+from mmap import ACCESS_READ, mmap
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
 from lxml import etree
 from nose.tools import assert_raises, eq_, ok_
 from six import b
@@ -99,3 +106,74 @@ def test_person_delete():
     with assert_raises(AttributeError) as capture:
         del person.last
     eq_(str(capture.exception), "'<class 'lxmlbind.tests.test_person.Person'>' object has no attribute 'last'")
+
+
+def test_person_iter_from_file():
+    """
+    Verify incremental decoding of matching elements.
+    """
+    xml = b("""<people><person><first>John</first></person><other/><person><first>Jane</first></person></people>""")
+
+    people = Person.iter_from_file(BytesIO(xml))
+    john = next(people)
+    eq_(john.first, "John")
+    jane = next(people)
+    eq_(jane.first, "Jane")
+    eq_(len(john._element), 0)
+    with assert_raises(StopIteration):
+        next(people)
+    # processed elements and their preceding siblings have been discarded
+    eq_(len(jane._element.getparent()), 1)
+
+    eq_([person.first for person in Person.iter_from_file(BytesIO(xml), clear=False)], ["John", "Jane"])
+
+
+def get_first(person):
+    return person.first
+
+
+def test_person_from_xml_many():
+    """
+    Verify batch decoding, with and without worker processes.
+    """
+    xmls = [b("<person><first>John</first></person>"), b("<person><first>Jane</first></person>")]
+
+    people = list(Person.from_xml_many(xmls))
+    eq_([person.first for person in people], ["John", "Jane"])
+    eq_(list(Person.from_xml_many(xmls, func=get_first, parser=etree.XMLParser())), ["John", "Jane"])
+
+    eq_(list(Person.from_xml_many(xmls, func=get_first, workers=2)), ["John", "Jane"])
+    eq_(list(Person.from_xml_many(xmls, workers=2)), xmls)
+
+
+def test_person_files():
+    """
+    Verify encoding to and decoding from files and buffers.
+    """
+    person = Person(first="Jöhn")
+    eq_(person.to_xml(), b("""<person type="object"><first>J&#246;hn</first></person>"""))
+    eq_(person.to_xml(encoding="utf-8"), u"""<person type="object"><first>Jöhn</first></person>""".encode("utf-8"))
+    eq_(person.to_xml(encoding="utf-8", xml_declaration=True),
+        u"""<?xml version='1.0' encoding='utf-8'?>\n<person type="object"><first>Jöhn</first></person>""".encode("utf-8"))
+
+    output = BytesIO()
+    person.to_file(output, encoding="UTF-8", xml_declaration=True)
+    eq_(output.getvalue(), person.to_xml(encoding="UTF-8", xml_declaration=True))
+
+    output.seek(0)
+    eq_(Person.from_file(output), person)
+    eq_(Person.from_file(memoryview(output.getvalue())), person)
+
+    directory = mkdtemp()
+    try:
+        path = join(directory, "person.xml")
+        person.to_file(path)
+        eq_(Person.from_file(path).first, u"Jöhn")
+        # byte strings are filenames, not XML
+        eq_(Person.from_file(path.encode("utf-8")).first, u"Jöhn")
+        with assert_raises(IOError):
+            Person.from_file(b("<person/>"))
+        with open(path, "rb") as source:
+            eq_(Person.from_file(mmap(source.fileno(), 0, access=ACCESS_READ)), person)
+    finally:
+        rmtree(directory)
@@ -73,3 +73,24 @@ def test_person_address_dict():
 
     eq_(len(collection), 1)
     eq_(collection["person"], person2)
+
+
+def test_person_address_dict_identity():
+    """
+    Verify that dict lookups return the same instances and maintain _parent references.
+    """
+    person1 = Person(first="John")
+    person2 = Person(first="Jane")
+
+    collection = PersonAddressDict()
+    collection.add(person1)
+    ok_(collection["person"] is person1)
+    ok_(collection.values()[0] is person1)
+
+    collection.add(person2)
+    ok_(collection["person"] is person2)
+    ok_(person1._parent is None)
+    ok_(person2._parent is collection)
+
+    del collection["person"]
+    ok_(person2._parent is None)
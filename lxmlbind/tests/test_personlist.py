@@ -1,4 +1,7 @@
 from copy import deepcopy
+from io import BytesIO
+
+from lxml import etree
 from nose.tools import assert_raises, eq_, ok_
 from six import b
 
@@ -83,3 +86,212 @@ def test_person_list():
     person_list[0] = person2
     eq_(person_list.to_xml(),
         b("""<person-list><person type="object"><first>Jane</first></person></person-list>"""))
+
+
+def test_person_list_identity():
+    """
+    Verify that the same element always yields the same instance.
+    """
+    person1 = Person(first="John")
+    person2 = Person(first="Jane")
+
+    person_list = PersonList()
+    person_list.append(person1)
+    person_list.append(person2)
+
+    ok_(person_list[0] is person1)
+    ok_(person_list[-1] is person2)
+    eq_([id(person) for person in person_list], [id(person1), id(person2)])
+
+    parsed_list = PersonList.from_xml(person_list.to_xml())
+    person = parsed_list[0]
+    ok_(parsed_list[0] is person)
+    ok_(next(iter(parsed_list)) is person)
+
+    # removed instances no longer point at the list
+    del person_list[0]
+    ok_(person1._parent is None)
+    person_list[0] = person1
+    ok_(person2._parent is None)
+    ok_(person1._parent is person_list)
+    ok_(person_list[0] is person1)
+
+
+def make_people(*names):
+    person_list = PersonList()
+    person_list.extend(Person(first=name) for name in names)
+    return person_list
+
+
+def firsts(people):
+    return [person.first for person in people]
+
+
+def test_person_list_slices():
+    """
+    Verify slicing with lazy views.
+    """
+    person_list = make_people("John", "Jane", "Joe", "Jim")
+    view = person_list[1:3]
+    eq_(len(view), 2)
+    eq_(firsts(view), ["Jane", "Joe"])
+    ok_(view[0] is person_list[1])
+    eq_(view[-1].first, "Joe")
+    eq_(firsts(person_list[::-1]), ["Jim", "Joe", "Jane", "John"])
+    eq_(firsts(person_list[::-1][1:3]), ["Joe", "Jane"])
+    eq_(view, [person_list[1], person_list[2]])
+
+    # views follow changes to the list
+    person_list.insert(0, Person(first="Jill"))
+    eq_(firsts(view), ["John", "Jane"])
+
+    # slice assignment and deletion
+    jill = person_list[0]
+    person_list[0:2] = [Person(first="Jack")]
+    eq_(firsts(person_list), ["Jack", "Jane", "Joe", "Jim"])
+    ok_(jill._parent is None)
+    person_list[:] = person_list[::-1]
+    eq_(firsts(person_list), ["Jim", "Joe", "Jane", "Jack"])
+    ok_(all(person._parent is person_list for person in person_list))
+    with assert_raises(ValueError):
+        person_list[::2] = [Person()]
+    eq_(len(person_list), 4)
+    jim = person_list[0]
+    del person_list[::2]
+    eq_(firsts(person_list), ["Joe", "Jack"])
+    ok_(jim._parent is None)
+
+
+def test_person_list_edits():
+    """
+    Verify list edits.
+    """
+    person_list = make_people("John", "Jane")
+    eq_(firsts(person_list), ["John", "Jane"])
+    ok_(all(person._parent is person_list for person in person_list))
+
+    person_list.insert(1, Person(first="Joe"))
+    eq_(firsts(person_list), ["John", "Joe", "Jane"])
+
+    jane = person_list.pop()
+    eq_(jane.first, "Jane")
+    ok_(jane._parent is None)
+    eq_(person_list.pop(0).first, "John")
+    eq_(firsts(person_list), ["Joe"])
+
+    joe = person_list[0]
+    person_list.remove(joe)
+    ok_(joe._parent is None)
+    with assert_raises(ValueError):
+        person_list.remove(joe)
+    with assert_raises(IndexError):
+        person_list.pop()
+
+    person_list = make_people("John", "Jane")
+    person_list._element.set("type", "list")
+    john = person_list[0]
+    person_list.clear()
+    eq_(len(person_list), 0)
+    ok_(john._parent is None)
+    eq_(person_list.to_xml(), b("""<person-list type="list"/>"""))
+
+
+def test_person_list_remove_where():
+    """
+    Verify bulk removal.
+    """
+    person_list = make_people("John", "Jane", "John", "Jim")
+    jane = person_list[1]
+    eq_(person_list.remove_where("person[first='John']"), 2)
+    eq_(firsts(person_list), ["Jane", "Jim"])
+    ok_(person_list[0] is jane)
+
+    eq_(person_list.remove_where(lambda person: person.first.startswith("Ji")), 1)
+    eq_(firsts(person_list), ["Jane"])
+
+    # only items are removed
+    eq_(person_list.remove_where("person/first"), 0)
+    eq_(person_list.remove_where(etree.XPath("*")), 1)
+    ok_(jane._parent is None)
+    eq_(len(person_list), 0)
+
+
+def test_person_list_sort():
+    """
+    Verify sorting, in place and by views.
+    """
+    person_list = make_people("John", "Jane", "Joe", None, "Jim")
+    people = list(person_list)
+
+    view = person_list.sorted_view(Person.first)
+    eq_(firsts(view), ["Jane", "Jim", "Joe", "John", None])
+    eq_(firsts(person_list), ["John", "Jane", "Joe", None, "Jim"])
+    ok_(view[0] is people[1])
+    eq_(firsts(view[1:3]), ["Jim", "Joe"])
+    eq_(firsts(person_list.sorted_view(Person.first, reverse=True)), [None, "John", "Joe", "Jim", "Jane"])
+    eq_(firsts(person_list.sorted_view(lambda person: len(person.first or ""))), [None, "Joe", "Jim", "John", "Jane"])
+
+    # views follow changes to the list
+    person_list.append(Person(first="Ann"))
+    eq_(firsts(view), ["Ann", "Jane", "Jim", "Joe", "John", None])
+    del person_list[-1]
+
+    person_list.sort(key=Person.first)
+    eq_(firsts(person_list), ["Jane", "Jim", "Joe", "John", None])
+    ok_(all(person._parent is person_list for person in person_list))
+    eq_([id(person) for person in person_list], [id(people[index]) for index in [1, 4, 2, 0, 3]])
+
+    person_list.sort(key=lambda person: person.first or "", reverse=True)
+    eq_(firsts(person_list), ["John", "Joe", "Jim", "Jane", None])
+
+
+def test_person_list_iter_from_file():
+    """
+    Verify incremental decoding of list items.
+    """
+    xml = b("""<person-list><person><first>John</first></person><person><first>Jane</first></person></person-list>""")
+
+    people = PersonList.iter_from_file(BytesIO(xml))
+    person = next(people)
+    eq_(person.first, "John")
+    ok_(isinstance(person._parent, PersonList))
+    person = next(people)
+    eq_(person.first, "Jane")
+    with assert_raises(StopIteration):
+        next(people)
+    eq_(len(person._parent), 1)
+
+    with assert_raises(Exception):
+        next(PersonList.iter_from_file(BytesIO(b("<other><person/></other>"))))
+
+
+def test_person_list_iter_to_file():
+    """
+    Verify incremental encoding of list items.
+    """
+    people = (Person(first=first) for first in ["John", "Jane"])
+    output = BytesIO()
+    PersonList.iter_to_file(output, people)
+    eq_(output.getvalue(),
+        b("""<person-list><person type="object"><first>John</first></person><person type="object"><first>Jane</first></person></person-list>"""))  # noqa
+
+    output.seek(0)
+    eq_([person.first for person in PersonList.iter_from_file(output)], ["John", "Jane"])
+
+
+def test_person_list_iter_to_file_parsed():
+    """
+    Verify that items from a parsed document are encoded without their tails.
+    """
+    people = PersonList.from_xml(b("""<person-list>\n  <person><first>John</first></person>tail\n"""
+                                   """  <person><first>Jane</first></person>\n</person-list>"""))
+    output = BytesIO()
+    PersonList.iter_to_file(output, people)
+    eq_(output.getvalue(),
+        b("""<person-list><person><first>John</first></person><person><first>Jane</first></person></person-list>"""))
+
+    output = BytesIO()
+    PersonList.iter_to_file(output, people, pretty_print=True)
+    eq_(output.getvalue(),
+        b("""<person-list><person>\n  <first>John</first>\n</person>\n"""
+          """<person>\n  <first>Jane</first>\n</person>\n</person-list>"""))
@@ -0,0 +1,171 @@
+from nose.tools import assert_raises, eq_, ok_
+
+from lxmlbind.api import Base, Property, tag
+from lxmlbind.schema import get_schema
+
+
+class Named(Base):
+    """
+    Example using properties named by assignment.
+    """
+    first = Property()
+    last = Property(auto=True)
+
+
+@tag("renamed")
+class Renamed(Named):
+    """
+    Example shadowing an inherited property.
+    """
+    last = Property("surname")
+
+
+def test_property_paths_bound_at_class_creation():
+    """
+    Property paths are resolved without constructing any instances.
+    """
+    eq_(Named.__dict__["first"].path, "first")
+    eq_(Named.__dict__["last"].tags, ["last"])
+
+
+def test_schema():
+    """
+    Schemas list properties in method resolution order, honoring shadowing.
+    """
+    schema = get_schema(Renamed)
+    eq_(schema.tag, "renamed")
+    eq_([name for name, _ in schema.properties], ["last", "first"])
+    eq_(schema.properties[0][1].path, "surname")
+    eq_(schema.auto_properties, ())
+    eq_(Renamed().to_xml(), b"<renamed/>")
+    eq_(Named().to_xml(), b"<named><last/></named>")
+
+
+class Noted(object):
+    """
+    Example mixin declaring a property outside of `Base`.
+    """
+    note = Property(auto=True, default="x")
+
+
+class Mixed(Base, Noted):
+    """
+    Example using a property from a mixin.
+    """
+    pass
+
+
+def test_mixin_properties():
+    """
+    Properties declared by mixins are bound when the schema is compiled.
+    """
+    eq_(Mixed().to_xml(), b"<mixed><note>x</note></mixed>")
+    eq_(Noted.__dict__["note"].path, "note")
+    eq_(Mixed.from_xml("<mixed><note>y</note></mixed>").note, "y")
+
+
+def test_schema_invalidation():
+    """
+    Schemas are recompiled when a class or one of its bases is modified.
+    """
+    class Late(Base):
+        pass
+
+    class LateChild(Late):
+        pass
+
+    eq_(get_schema(LateChild).properties, ())
+    Late.added = Property(auto=True)
+    eq_(Late.added.path, "added")
+    eq_([name for name, _ in get_schema(LateChild).properties], ["added"])
+    ok_(get_schema(LateChild) is get_schema(LateChild))
+
+    del Late.added
+    eq_(get_schema(LateChild).properties, ())
+
+
+class Shared(Base):
+    """
+    Example using auto properties with a common path prefix.
+    """
+    number = Property("value/number", auto=True, default="1")
+    unit = Property("value/unit", auto=True)
+    note = Property()
+
+
+def test_materialize():
+    """
+    Auto properties are created once each, sharing parent elements.
+    """
+    eq_(Shared(), Shared.from_xml("<shared><value><number>1</number><unit/></value></shared>"))
+    eq_(Shared(note="n"), Shared.from_xml("<shared><value><number>1</number><unit/></value><note>n</note></shared>"))
+
+    shared = Shared.from_xml("<shared><value><unit>m</unit></value></shared>", defer=False)
+    eq_(shared.number, "1")
+    eq_(shared.unit, "m")
+    eq_(len(shared._element), 1)
+    eq_(len(shared._element[0]), 2)
+
+
+def test_deferred():
+    """
+    Wrapping an existing element defers creating auto properties until a write.
+    """
+    xml = b"<shared><value><unit>m</unit></value></shared>"
+    shared = Shared.from_xml(xml)
+    eq_(shared.unit, "m")
+    eq_(shared.to_xml(), xml)
+
+    shared.note = "n"
+    eq_(shared, Shared.from_xml("<shared><value><unit>m</unit><number>1</number></value><note>n</note></shared>"))
+
+    # reading a missing auto property gives its default, without creating it
+    shared = Shared.from_xml(xml)
+    eq_(shared.number, "1")
+    eq_(shared.to_xml(), xml)
+
+    # initialization may also be requested up front
+    eq_(len(Shared.from_xml(xml, defer=False)._element[0]), 2)
+
+
+def test_deferred_defaults():
+    """
+    Reading deferred auto properties gives the same values as initialized ones, in any order.
+    """
+    empty = b"<shared><value><number/></value></shared>"
+    eq_(Shared.from_xml(empty).number, "1")
+    eq_(Shared.from_xml(empty, defer=False).number, "1")
+
+    xml = b"<shared><value><number/></value><note/></shared>"
+    shared = Shared.from_xml(xml)
+    eq_(shared.number, "1")
+    eq_(shared.unit, None)
+    eq_(shared.number, "1")
+    eq_(shared.to_xml(), xml)
+
+    shared = Shared.from_xml(b"<shared/>")
+    eq_(shared.unit, None)
+    eq_(shared.number, "1")
+    eq_(shared.to_xml(), b"<shared/>")
+
+
+class Extended(Named):
+    """
+    Example opting out of slots.
+    """
+    __slots__ = ("__dict__",)
+
+
+def test_slots():
+    """
+    Instances use slots, unless a class opts out.
+    """
+    named = Named()
+    ok_(not hasattr(named, "__dict__"))
+    with assert_raises(AttributeError):
+        named.extra = True
+
+    extended = Extended(first="John")
+    extended.extra = True
+    eq_(extended.extra, True)
+    eq_(extended.first, "John")
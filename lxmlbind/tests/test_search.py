@@ -0,0 +1,57 @@
+from nose.tools import eq_, ok_
+
+from lxmlbind.api import Base, Property
+
+
+class Nested(Base):
+    """
+    Example using deep paths.
+    """
+    inner = Property("outer/inner")
+    accented = Property(u"outer/\u00e9t\u00e9")
+    first = Property("outer/inner", filter_func=lambda element: element.get("n") == "1")
+
+
+def test_deep_path_uses_first_match():
+    """
+    Deep paths only consider the first element for each tag, as before.
+    """
+    nested = Nested.from_xml("<nested><outer/><outer><inner>b</inner></outer></nested>")
+    eq_(nested.inner, None)
+
+    nested = Nested.from_xml("<nested><outer><inner>a</inner></outer><outer><inner>b</inner></outer></nested>")
+    eq_(nested.inner, "a")
+
+
+def test_deep_path_create():
+    """
+    Missing elements are created beneath the first matching parent.
+    """
+    nested = Nested.from_xml("<nested><outer><other/></outer><outer/></nested>")
+    nested.inner = "a"
+    eq_(nested.to_xml(), b"<nested><outer><other/><inner>a</inner></outer><outer/></nested>")
+
+
+def test_non_xpath_tags():
+    """
+    Tags that are not valid XPath names are still resolved.
+    """
+    nested = Nested()
+    nested.accented = "a"
+    eq_(nested.accented, "a")
+    eq_(nested.inner, None)
+
+
+def test_filter_func_reassignment():
+    """
+    Changing a property's filter recompiles its resolver.
+    """
+    nested = Nested.from_xml("""<nested><outer><inner n="0">a</inner><inner n="1">b</inner></outer></nested>""")
+    property_ = Nested.__dict__["first"]
+    eq_(nested.first, "b")
+    property_.filter_func = lambda element: element.get("n") == "0"
+    try:
+        eq_(nested.first, "a")
+    finally:
+        property_.filter_func = lambda element: element.get("n") == "1"
+    ok_(property_._resolver is None)
@@ -51,3 +51,20 @@ def test_trivial_from_xml():
                     "<trivial></trivial>",
                     "<trivial><ignore>this</ignore></trivial>"]:
         yield assert_generates_equivalent_xml, Trivial, raw_xml
+
+
+def test_eq_xml():
+    """
+    Verify XML comparison rules.
+    """
+    def eq(this, that, **kwargs):
+        return eq_xml(etree.XML(this), etree.XML(that), **kwargs)
+
+    ok_(eq("<a><b>1</b><c/><b>2</b></a>", "<a><c/><b>1</b><b>2</b></a>"))
+    ok_(not eq("<a><b>1</b><b>2</b></a>", "<a><b>2</b><b>1</b></a>"))
+    ok_(eq("<a x='1'> <b/> </a>", "<a x='1'><b/></a>"))
+    ok_(not eq("<a> <b/> </a>", "<a><b/></a>", ignore_whitespace=False))
+    ok_(not eq("<a x='1'/>", "<a x='2'/>"))
+    ok_(eq("<a x='1' y='1'/>", "<a x='2' y='1'/>", ignore_attributes=["x"]))
+    ok_(not eq("<a><b><c>1</c></b></a>", "<a><b><c>2</c></b></a>"))
+    ok_(not eq("<a><b/></a>", "<a><b/><b/></a>"))
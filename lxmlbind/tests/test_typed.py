@@ -0,0 +1,126 @@
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+
+from nose.tools import assert_raises, eq_, ok_
+
+from lxmlbind.api import (Base, BoolProperty, DateTimeProperty, DecimalProperty, EnumProperty, FloatProperty,
+                          IntProperty, List, of, tag)
+from lxmlbind.tests.test_person import Person
+
+
+class Color(Enum):
+    red = 1
+    green = 2
+
+
+class Measurement(Base):
+    """
+    Example using typed properties.
+    """
+    count = IntProperty(memoize=True)
+    ratio = FloatProperty()
+    amount = DecimalProperty()
+    valid = BoolProperty()
+    taken = DateTimeProperty(memoize=True)
+    color = EnumProperty(Color)
+
+
+@tag("measurements")
+@of(Measurement)
+class Measurements(List):
+    """
+    Example using typed properties with a collection.
+    """
+    pass
+
+
+def test_typed():
+    """
+    Typed properties convert to and from text.
+    """
+    measurement = Measurement()
+    measurement.count = 3
+    measurement.ratio = 0.25
+    measurement.amount = Decimal("1.10")
+    measurement.valid = False
+    measurement.taken = datetime(2013, 11, 25, 12, 30)
+    measurement.color = Color.green
+
+    eq_(measurement.to_xml(),
+        b"<measurement><count>3</count><ratio>0.25</ratio><amount>1.10</amount><valid>false</valid>"
+        b"<taken>2013-11-25T12:30:00</taken><color>2</color></measurement>")
+
+    parsed = Measurement.from_xml(measurement.to_xml())
+    eq_(parsed.count, 3)
+    eq_(parsed.ratio, 0.25)
+    eq_(parsed.amount, Decimal("1.10"))
+    eq_(parsed.valid, False)
+    eq_(parsed.taken, datetime(2013, 11, 25, 12, 30))
+    ok_(parsed.color is Color.green)
+
+    parsed.color = 1
+    ok_(parsed.color is Color.red)
+    parsed.search(Measurement.valid).text = "maybe"
+    with assert_raises(ValueError):
+        parsed.valid
+
+
+def test_memoize():
+    """
+    Memoized values are reused while the element text is unchanged.
+    """
+    measurement = Measurement.from_xml("<measurement><taken>2013-11-25T12:30:00</taken></measurement>")
+    taken = measurement.taken
+    ok_(measurement.taken is taken)
+
+    measurement.taken = datetime(2014, 1, 1)
+    eq_(measurement.taken, datetime(2014, 1, 1))
+
+    measurement.search(Measurement.taken).text = "2015-01-01T00:00:00"
+    eq_(measurement.taken, datetime(2015, 1, 1))
+
+    eq_(measurement.count, None)
+    measurement.count = 2
+    eq_(measurement.count, 2)
+
+
+class MemoizedEntry(Base):
+    """
+    Example using a memoized child object.
+    """
+    person = Person.property(memoize=True)
+
+
+def test_memoize_delete():
+    """
+    Deleting a memoized property discards its value.
+    """
+    entry = MemoizedEntry()
+    person = entry.person
+    person.first = "John"
+    ok_(entry.person is person)
+
+    del entry.person
+    ok_(entry.person is not person)
+    ok_(entry.person._element.getparent() is entry._element)
+    eq_(entry.person.first, None)
+
+    # as does replacing the element behind the object's back
+    person = entry.person
+    entry._element.replace(person._element, Person(first="Jane")._element)
+    eq_(entry.person.first, "Jane")
+
+
+def test_typed_column():
+    """
+    Standard typed properties are converted in bulk.
+    """
+    measurements = Measurements()
+    for count, valid in [(1, True), (2, False)]:
+        measurements.append(Measurement(count=count, valid=valid, color=Color.red))
+    eq_(measurements.column(Measurement.count), [1, 2])
+    eq_(measurements.column(Measurement.valid), [True, False])
+    eq_(measurements.column(Measurement.color), [Color.red, Color.red])
+    measurements.set_column(Measurement.valid, [False, True])
+    eq_([measurement.valid for measurement in measurements], [False, True])
@@ -0,0 +1,85 @@
+from gc import disable, enable, isenabled
+from weakref import ref
+
+from nose.tools import eq_, ok_
+
+from lxmlbind.api import attributes, Base, Property, tag, weak_parent
+from lxmlbind.tests.test_addressbookentry import AddressBookEntry
+from lxmlbind.tests.test_person import Person
+from lxmlbind.tests.test_personaddressdict import PersonAddressDict
+from lxmlbind.tests.test_personlist import PersonList
+
+
+@weak_parent
+@tag("person")
+@attributes(type="object")
+class WeakPerson(Person):
+    """
+    Example using a weak parent reference.
+    """
+    pass
+
+
+class MemoizedEntry(Base):
+    """
+    Example of a parent holding on to its child.
+    """
+    name = Property()
+    person = WeakPerson.property(memoize=True)
+
+
+def assert_freed_by_refcount(factory):
+    """
+    Verify that objects created by `factory` are freed without the cyclic garbage collector.
+    """
+    enabled = isenabled()
+    disable()
+    try:
+        references = [ref(instance) for instance in factory()]
+        ok_(all(reference() is None for reference in references))
+    finally:
+        if enabled:
+            enable()
+
+
+def test_freed_by_refcount():
+    """
+    Parents and children do not form reference cycles.
+    """
+    def people():
+        person_list = PersonList()
+        person_list.append(Person(first="John"))
+        return [person_list] + list(person_list)
+
+    def dicts():
+        collection = PersonAddressDict()
+        collection.add(Person(first="John"))
+        return [collection, collection["person"]]
+
+    def entries():
+        entry = AddressBookEntry()
+        entry.person.first = "John"
+        return [entry, entry.person]
+
+    def memoized():
+        entry = MemoizedEntry()
+        entry.person.first = "John"
+        return [entry, entry.person]
+
+    for factory in [people, dicts, entries, memoized]:
+        yield assert_freed_by_refcount, factory
+
+
+def test_weak_parent():
+    """
+    Weak parent references are followed while the parent is alive.
+    """
+    entry = MemoizedEntry()
+    person = entry.person
+    ok_(person._parent is entry)
+    ok_(entry.person is person)
+    person.first = "John"
+    eq_(entry.person.first, "John")
+
+    del entry
+    ok_(person._parent is None)